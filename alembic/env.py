@@ -1,46 +1,50 @@
-import subprocess
-import os
-from alembic import op
-import sqlalchemy as sa
-
-def test_alembic_upgrade_runs():
-    # Run alembic upgrade to head
-    result = subprocess.run(
-        ["alembic", "upgrade", "head"],
-        cwd=os.path.abspath(os.path.join(os.path.dirname(__file__), "..")),
-        capture_output=True,
-        text=True
-    )
-    print(result.stdout)
-    assert result.returncode == 0, f"Alembic upgrade failed:\n{result.stderr}"
+# alembic/env.py
+# `alembic upgrade head` runs once per deploy, before the app starts (see
+# docker-compose.yaml); the app itself never creates tables in production.
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import engine_from_config, pool
 
+from app.config import get_settings
+from app.models import Base
 
+config = context.config
 
-# If using Alembic, create a migration
-"""
-Add OAuth fields to users table
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
 
-Revision ID: add_oauth_fields
-Revises: previous_revision
-Create Date: 2024-01-01 00:00:00.000000
+# Same database as the app (DATABASE_URL), not the placeholder in alembic.ini
+config.set_main_option("sqlalchemy.url", get_settings().database_url.replace("%", "%%"))
 
-"""
+target_metadata = Base.metadata
 
 
-def upgrade():
-    op.add_column('users', sa.Column('google_id', sa.String(), nullable=True))
-    op.add_column('users', sa.Column('apple_id', sa.String(), nullable=True))
-    op.add_column('users', sa.Column('email_verified', sa.Boolean(), default=False))
-    op.add_column('users', sa.Column('auth_method', sa.String(), default='email'))
-    
-    # Create indexes
-    op.create_index(op.f('ix_users_google_id'), 'users', ['google_id'], unique=True)
-    op.create_index(op.f('ix_users_apple_id'), 'users', ['apple_id'], unique=True)
+def run_migrations_offline() -> None:
+    """Emit the migration SQL without connecting (`alembic upgrade --sql`)."""
+    context.configure(
+        url=config.get_main_option("sqlalchemy.url"),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connectable = engine_from_config(
+        config.get_section(config.config_ini_section, {}),
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+    with connectable.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+
 
-def downgrade():
-    op.drop_index(op.f('ix_users_apple_id'), table_name='users')
-    op.drop_index(op.f('ix_users_google_id'), table_name='users')
-    op.drop_column('users', 'auth_method')
-    op.drop_column('users', 'email_verified')
-    op.drop_column('users', 'apple_id')
-    op.drop_column('users', 'google_id')    
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,43 @@
+"""delete tour_images rows with their tour (ON DELETE CASCADE)
+
+Revision ID: 0c5e9a2d7f31
+Revises: f8c1b4e6a205
+Create Date: 2026-10-15 15:37:20.481966
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0c5e9a2d7f31'
+down_revision: Union[str, None] = 'f8c1b4e6a205'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FK_NAME = 'fk_tour_images_tour_id_tours'
+# SQLite reports the original constraint unnamed; batch mode can only drop it
+# once the convention gives it this name
+NAMING_CONVENTION = {'fk': 'fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s'}
+
+
+def _replace_tour_fk(ondelete: Union[str, None]) -> None:
+    existing = next(
+        (fk['name'] for fk in sa.inspect(op.get_bind()).get_foreign_keys('tour_images')
+         if fk['referred_table'] == 'tours'),
+        None,
+    )
+    with op.batch_alter_table('tour_images', naming_convention=NAMING_CONVENTION) as batch_op:
+        batch_op.drop_constraint(existing or FK_NAME, type_='foreignkey')
+        batch_op.create_foreign_key(FK_NAME, 'tours', ['tour_id'], ['id'], ondelete=ondelete)
+
+
+def upgrade() -> None:
+    # delete_tour issues one DELETE FROM tours; the images follow in the database
+    _replace_tour_fk('CASCADE')
+
+
+def downgrade() -> None:
+    _replace_tour_fk(None)
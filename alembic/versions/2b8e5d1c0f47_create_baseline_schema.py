@@ -0,0 +1,193 @@
+"""create the baseline schema on databases that don't have it
+
+Revision ID: 2b8e5d1c0f47
+Revises: 918bd1781bce
+Create Date: 2026-10-16 09:12:44.305871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2b8e5d1c0f47'
+down_revision: Union[str, None] = '918bd1781bce'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The revisions before this one are empty: the tables used to be created
+    # by Base.metadata.create_all at app startup. Databases created that way
+    # already have them and skip this step; a fresh database gets the schema
+    # as it stood then, which the later revisions build on.
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    if 'countries' not in existing:
+        op.create_table('countries',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('slug', sa.String(length=50), nullable=True),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('description', sa.String(length=1000), nullable=True),
+        sa.Column('food', sa.String(length=1000), nullable=True),
+        sa.Column('dress', sa.String(length=1000), nullable=True),
+        sa.Column('traditions', sa.String(length=1500), nullable=True),
+        sa.Column('tour_themes', sa.String(length=1000), nullable=True),
+        sa.Column('video_url', sa.String(length=300), nullable=True),
+        sa.Column('video_credit', sa.String(length=200), nullable=True),
+        sa.Column('testimonial', sa.String(length=1500), nullable=True),
+        sa.Column('badge_label', sa.String(length=50), nullable=True),
+        sa.Column('badge_color', sa.String(length=50), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_countries_id'), 'countries', ['id'], unique=False)
+        op.create_index(op.f('ix_countries_slug'), 'countries', ['slug'], unique=True)
+    if 'sessions' not in existing:
+        op.create_table('sessions',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('expires_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_sessions_user_id'), 'sessions', ['user_id'], unique=False)
+    if 'users' not in existing:
+        op.create_table('users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('email', sa.String(length=100), nullable=True),
+        sa.Column('hashed_password', sa.String(length=200), nullable=True),
+        sa.Column('full_name', sa.String(length=100), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('is_admin', sa.Boolean(), nullable=True),
+        sa.Column('phone', sa.String(length=50), nullable=True),
+        sa.Column('bio', sa.Text(), nullable=True),
+        sa.Column('is_superadmin', sa.Boolean(), nullable=True),
+        sa.Column('newsletter_subscribed', sa.Boolean(), nullable=True),
+        sa.Column('unsubscribe_token', sa.String(length=36), nullable=True),
+        sa.Column('company_name', sa.String(length=100), nullable=True),
+        sa.Column('company_link', sa.String(length=200), nullable=True),
+        sa.Column('picture', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('google_id', sa.String(length=255), nullable=True),
+        sa.Column('apple_id', sa.String(length=255), nullable=True),
+        sa.Column('email_verified', sa.Boolean(), nullable=True),
+        sa.Column('auth_method', sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_users_apple_id'), 'users', ['apple_id'], unique=True)
+        op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+        op.create_index(op.f('ix_users_google_id'), 'users', ['google_id'], unique=True)
+        op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    if 'country_images' not in existing:
+        op.create_table('country_images',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('country_id', sa.Integer(), nullable=True),
+        sa.Column('image_url', sa.String(length=300), nullable=False),
+        sa.Column('alt_text', sa.String(length=200), nullable=True),
+        sa.Column('is_primary', sa.Boolean(), nullable=True),
+        sa.Column('filename', sa.String(length=200), nullable=True),
+        sa.Column('filepath', sa.String(length=500), nullable=True),
+        sa.ForeignKeyConstraint(['country_id'], ['countries.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_country_images_country_id'), 'country_images', ['country_id'], unique=False)
+        op.create_index(op.f('ix_country_images_id'), 'country_images', ['id'], unique=False)
+    if 'tours' not in existing:
+        op.create_table('tours',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(length=100), nullable=True),
+        sa.Column('description', sa.String(length=500), nullable=True),
+        sa.Column('price', sa.Float(), nullable=True),
+        sa.Column('duration', sa.String(length=50), nullable=True),
+        sa.Column('locations', sa.String(length=100), nullable=True),
+        sa.Column('image_url', sa.String(length=200), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('tour_type', sa.String(length=50), nullable=True),
+        sa.Column('difficulty', sa.String(length=500), nullable=True),
+        sa.Column('country', sa.String(length=100), nullable=False),
+        sa.Column('max_participants', sa.Integer(), nullable=True),
+        sa.Column('included', sa.String(length=1000), nullable=False),
+        sa.Column('not_included', sa.String(length=1000), nullable=False),
+        sa.Column('cancellation_policy', sa.String(length=500), nullable=False),
+        sa.Column('creator_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['creator_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_tours_id'), 'tours', ['id'], unique=False)
+        op.create_index(op.f('ix_tours_title'), 'tours', ['title'], unique=False)
+    if 'bookings' not in existing:
+        op.create_table('bookings',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('tour_id', sa.Integer(), nullable=True),
+        sa.Column('adults', sa.Integer(), nullable=True),
+        sa.Column('kids', sa.Integer(), nullable=True),
+        sa.Column('tour_date', sa.DateTime(), nullable=True),
+        sa.Column('total_price', sa.Float(), nullable=True),
+        sa.Column('is_private', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('payment_method', sa.String(length=20), nullable=True),
+        sa.Column('payment_id', sa.String(length=50), nullable=True),
+        sa.Column('payment_status', sa.String(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=True),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True),
+        sa.Column('cancelled_at', sa.DateTime(), nullable=True),
+        sa.Column('donation', sa.Float(), nullable=True),
+        sa.Column('special_requirements', sa.String(length=500), nullable=True),
+        sa.ForeignKeyConstraint(['tour_id'], ['tours.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_bookings_id'), 'bookings', ['id'], unique=False)
+    if 'reviews' not in existing:
+        op.create_table('reviews',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('tour_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('rating', sa.Integer(), nullable=False),
+        sa.Column('comment', sa.Text(), nullable=True),
+        sa.Column('is_verified', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['tour_id'], ['tours.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_reviews_id'), 'reviews', ['id'], unique=False)
+    if 'tour_images' not in existing:
+        op.create_table('tour_images',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('tour_id', sa.Integer(), nullable=True),
+        sa.Column('image_url', sa.String(length=200), nullable=True),
+        sa.Column('is_primary', sa.Boolean(), nullable=True),
+        sa.ForeignKeyConstraint(['tour_id'], ['tours.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_tour_images_id'), 'tour_images', ['id'], unique=False)
+    if 'messages' not in existing:
+        op.create_table('messages',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('sender_id', sa.Integer(), nullable=False),
+        sa.Column('receiver_id', sa.Integer(), nullable=False),
+        sa.Column('booking_id', sa.Integer(), nullable=True),
+        sa.Column('parent_message_id', sa.Integer(), nullable=True),
+        sa.Column('subject', sa.String(length=255), nullable=True),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('status', sa.Enum('UNREAD', 'READ', 'ARCHIVED', name='messagestatus'), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['booking_id'], ['bookings.id'], ),
+        sa.ForeignKeyConstraint(['parent_message_id'], ['messages.id'], ),
+        sa.ForeignKeyConstraint(['receiver_id'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['sender_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_messages_id'), 'messages', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    # Tables that predate this revision can't be told apart from the ones it
+    # created, so they are left in place
+    pass
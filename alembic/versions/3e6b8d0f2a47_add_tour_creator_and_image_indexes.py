@@ -0,0 +1,38 @@
+"""add tours(creator_id, is_active) and tour_images(tour_id) indexes
+
+Revision ID: 3e6b8d0f2a47
+Revises: a81c4e2b9f63
+Create Date: 2026-10-15 12:14:50.274913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e6b8d0f2a47'
+down_revision: Union[str, None] = 'a81c4e2b9f63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY on Postgres so live tables aren't locked against writes;
+    # it cannot run inside a transaction, hence the autocommit block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tours_creator_active', 'tours', ['creator_id', 'is_active'],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_tour_images_tour_id', 'tour_images', ['tour_id'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_tour_images_tour_id', table_name='tour_images', postgresql_concurrently=True)
+        op.drop_index('ix_tours_creator_active', table_name='tours', postgresql_concurrently=True)
@@ -0,0 +1,57 @@
+"""copy tours.creator_id onto bookings and reviews
+
+Revision ID: 3e9b7c1f6d24
+Revises: 7a2e6d9c4b50
+Create Date: 2026-10-15 23:41:09.552814
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e9b7c1f6d24'
+down_revision: Union[str, None] = '7a2e6d9c4b50'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ['bookings', 'reviews']
+# SQLite reflects unnamed foreign keys; batch mode finds them by this name
+NAMING_CONVENTION = {'fk': 'fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s'}
+
+
+def upgrade() -> None:
+    tours = sa.table('tours', sa.column('id'), sa.column('creator_id'))
+    for name in TABLES:
+        # Nullable and without a default, so adding it doesn't rewrite the table
+        with op.batch_alter_table(name, naming_convention=NAMING_CONVENTION) as batch_op:
+            batch_op.add_column(sa.Column('creator_id', sa.Integer(), nullable=True))
+            batch_op.create_foreign_key(f'fk_{name}_creator_id_users', 'users', ['creator_id'], ['id'])
+        table = sa.table(name, sa.column('tour_id'), sa.column('creator_id'))
+        op.execute(
+            table.update().values(
+                creator_id=sa.select(tours.c.creator_id)
+                .where(tours.c.id == table.c.tour_id)
+                .scalar_subquery()
+            )
+        )
+
+    with op.get_context().autocommit_block():
+        for name in TABLES:
+            op.create_index(
+                f'ix_{name}_creator_created', name, ['creator_id', 'created_at'],
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in TABLES:
+            op.drop_index(f'ix_{name}_creator_created', table_name=name, postgresql_concurrently=True)
+
+    for name in TABLES:
+        with op.batch_alter_table(name, naming_convention=NAMING_CONVENTION) as batch_op:
+            batch_op.drop_constraint(f'fk_{name}_creator_id_users', type_='foreignkey')
+            batch_op.drop_column('creator_id')
@@ -0,0 +1,40 @@
+"""set null on message parent delete
+
+Revision ID: 5b1f0c2d7e41
+Revises: 2b8e5d1c0f47
+Create Date: 2026-10-15 09:12:40.118532
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1f0c2d7e41'
+down_revision: Union[str, None] = '2b8e5d1c0f47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Messages are deleted with a single DELETE statement, so replies must be
+    # detached by the database rather than by the ORM.
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_constraint('messages_parent_message_id_fkey', 'messages', type_='foreignkey')
+    op.create_foreign_key(
+        'messages_parent_message_id_fkey', 'messages', 'messages',
+        ['parent_message_id'], ['id'], ondelete='SET NULL'
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_constraint('messages_parent_message_id_fkey', 'messages', type_='foreignkey')
+    op.create_foreign_key(
+        'messages_parent_message_id_fkey', 'messages', 'messages',
+        ['parent_message_id'], ['id']
+    )
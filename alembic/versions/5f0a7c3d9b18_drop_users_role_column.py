@@ -0,0 +1,39 @@
+"""drop users.role; the role is derived from is_admin/is_superadmin
+
+Revision ID: 5f0a7c3d9b18
+Revises: 3e6b8d0f2a47
+Create Date: 2026-10-15 12:58:23.640172
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f0a7c3d9b18'
+down_revision: Union[str, None] = '3e6b8d0f2a47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+user_role = sa.Enum('customer', 'admin', 'superadmin', name='userrole')
+
+
+def upgrade() -> None:
+    # The column only exists where the schema was created from the models
+    # (create_all); no earlier migration added it
+    columns = {c['name'] for c in sa.inspect(op.get_bind()).get_columns('users')}
+    if 'role' in columns:
+        with op.batch_alter_table('users') as batch_op:
+            batch_op.drop_column('role')
+    user_role.drop(op.get_bind(), checkfirst=True)
+
+
+def downgrade() -> None:
+    user_role.create(op.get_bind(), checkfirst=True)
+    op.add_column('users', sa.Column('role', user_role, nullable=False, server_default='customer'))
+    users = sa.table('users', sa.column('role', user_role), sa.column('is_admin'), sa.column('is_superadmin'))
+    op.execute(users.update().where(users.c.is_admin == sa.true()).values(role='admin'))
+    op.execute(users.update().where(users.c.is_superadmin == sa.true()).values(role='superadmin'))
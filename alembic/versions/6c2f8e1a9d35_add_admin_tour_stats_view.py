@@ -0,0 +1,76 @@
+"""add the mv_admin_tour_stats materialized view (Postgres)
+
+Revision ID: 6c2f8e1a9d35
+Revises: 3e9b7c1f6d24
+Create Date: 2026-10-15 23:52:37.481206
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6c2f8e1a9d35'
+down_revision: Union[str, None] = '3e9b7c1f6d24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # SQLite/MySQL have no materialized views; app/analytics.py aggregates
+    # bookings and reviews live there
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    # Bookings and reviews are aggregated per tour before the join, so one
+    # doesn't multiply the other's rows
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW mv_admin_tour_stats AS
+        SELECT t.creator_id,
+               t.id AS tour_id,
+               COALESCE(b.bookings, 0) AS bookings,
+               COALESCE(b.pending, 0) AS pending,
+               COALESCE(b.confirmed, 0) AS confirmed,
+               COALESCE(b.revenue, 0) AS revenue,
+               COALESCE(r.reviews, 0) AS reviews,
+               COALESCE(r.r1, 0) AS r1,
+               COALESCE(r.r2, 0) AS r2,
+               COALESCE(r.r3, 0) AS r3,
+               COALESCE(r.r4, 0) AS r4,
+               COALESCE(r.r5, 0) AS r5,
+               now() AS refreshed_at
+        FROM tours t
+        LEFT JOIN (
+            SELECT tour_id,
+                   COUNT(*) AS bookings,
+                   COUNT(*) FILTER (WHERE status = 'pending') AS pending,
+                   COUNT(*) FILTER (WHERE status = 'confirmed') AS confirmed,
+                   SUM(total_price) FILTER (WHERE status = 'confirmed') AS revenue
+            FROM bookings
+            GROUP BY tour_id
+        ) b ON b.tour_id = t.id
+        LEFT JOIN (
+            SELECT tour_id,
+                   COUNT(*) AS reviews,
+                   COUNT(*) FILTER (WHERE rating = 1) AS r1,
+                   COUNT(*) FILTER (WHERE rating = 2) AS r2,
+                   COUNT(*) FILTER (WHERE rating = 3) AS r3,
+                   COUNT(*) FILTER (WHERE rating = 4) AS r4,
+                   COUNT(*) FILTER (WHERE rating = 5) AS r5
+            FROM reviews
+            GROUP BY tour_id
+        ) r ON r.tour_id = t.id
+        """
+    )
+    # Required by REFRESH ... CONCURRENTLY; also serves the per-operator reads
+    op.create_index(
+        'ux_mv_admin_tour_stats', 'mv_admin_tour_stats', ['creator_id', 'tour_id'], unique=True
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_admin_tour_stats")
@@ -0,0 +1,37 @@
+"""add created_at indexes for recent bookings and reviews
+
+Revision ID: 7a2e6d9c4b50
+Revises: 0c5e9a2d7f31
+Create Date: 2026-10-15 23:20:41.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a2e6d9c4b50'
+down_revision: Union[str, None] = '0c5e9a2d7f31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_bookings_created', 'bookings', ['created_at']),
+    ('ix_bookings_tour_created', 'bookings', ['tour_id', 'created_at']),
+    ('ix_reviews_created', 'reviews', ['created_at']),
+    ('ix_reviews_tour_created', 'reviews', ['tour_id', 'created_at']),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,35 @@
+"""add users.unread_count counter
+
+Revision ID: 7d3f5a9c1e20
+Revises: e2a94f6c31d8
+Create Date: 2026-10-15 11:02:41.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d3f5a9c1e20'
+down_revision: Union[str, None] = 'e2a94f6c31d8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('unread_count', sa.Integer(), nullable=False, server_default='0'))
+
+    users = sa.table('users', sa.column('id'), sa.column('unread_count'))
+    messages = sa.table('messages', sa.column('receiver_id'), sa.column('status'))
+    unread = (
+        sa.select(sa.func.count())
+        .where(messages.c.receiver_id == users.c.id, messages.c.status == 'UNREAD')
+        .scalar_subquery()
+    )
+    op.execute(users.update().values(unread_count=unread))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'unread_count')
@@ -0,0 +1,52 @@
+"""native uuid for sessions.id and users.unsubscribe_token
+
+Revision ID: a81c4e2b9f63
+Revises: 7d3f5a9c1e20
+Create Date: 2026-10-15 11:37:05.502117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a81c4e2b9f63'
+down_revision: Union[str, None] = '7d3f5a9c1e20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+UUID_COLUMNS = [('sessions', 'id'), ('users', 'unsubscribe_token')]
+
+
+def upgrade() -> None:
+    # SQLite/MySQL keep VARCHAR(36) with Python-generated values
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pgcrypto')
+    for table, column in UUID_COLUMNS:
+        op.alter_column(
+            table, column,
+            existing_type=sa.String(length=36),
+            type_=postgresql.UUID(as_uuid=False),
+            postgresql_using=f'{column}::uuid',
+            server_default=sa.text('gen_random_uuid()'),
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for table, column in UUID_COLUMNS:
+        op.alter_column(
+            table, column,
+            existing_type=postgresql.UUID(as_uuid=False),
+            type_=sa.String(length=36),
+            postgresql_using=f'{column}::text',
+            server_default=None,
+        )
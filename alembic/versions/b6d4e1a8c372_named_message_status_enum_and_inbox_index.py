@@ -0,0 +1,64 @@
+"""name the message status enum and add the (receiver_id, status, created_at) inbox index
+
+Revision ID: b6d4e1a8c372
+Revises: 5f0a7c3d9b18
+Create Date: 2026-10-15 14:02:37.918406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6d4e1a8c372'
+down_revision: Union[str, None] = '5f0a7c3d9b18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+message_status = sa.Enum('UNREAD', 'READ', 'ARCHIVED', name='message_status')
+
+
+def _rename_enum_type(old: str, new: str) -> None:
+    # create_all named the type after the class (messagestatus); rename it in
+    # place so existing rows and columns keep working
+    op.execute(
+        f"DO $$ BEGIN "
+        f"IF EXISTS (SELECT 1 FROM pg_type WHERE typname = '{old}') THEN "
+        f"ALTER TYPE {old} RENAME TO {new}; "
+        f"END IF; END $$"
+    )
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        _rename_enum_type('messagestatus', 'message_status')
+
+    op.execute("UPDATE messages SET status = 'UNREAD' WHERE status IS NULL")
+    with op.batch_alter_table('messages') as batch_op:
+        batch_op.alter_column('status', existing_type=message_status, nullable=False)
+
+    # CONCURRENTLY on Postgres so the messages table isn't locked against writes
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_msg_inbox', 'messages', ['receiver_id', 'status', 'created_at'],
+            postgresql_concurrently=True,
+        )
+        # Its (receiver_id, status) prefix answers every query this one did
+        op.drop_index('ix_messages_receiver_status', table_name='messages', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_messages_receiver_status', 'messages', ['receiver_id', 'status'],
+            postgresql_concurrently=True,
+        )
+        op.drop_index('ix_msg_inbox', table_name='messages', postgresql_concurrently=True)
+
+    with op.batch_alter_table('messages') as batch_op:
+        batch_op.alter_column('status', existing_type=message_status, nullable=True)
+
+    if op.get_bind().dialect.name == 'postgresql':
+        _rename_enum_type('message_status', 'messagestatus')
@@ -0,0 +1,36 @@
+"""add message query indexes
+
+Revision ID: c47d2a9e8b13
+Revises: 5b1f0c2d7e41
+Create Date: 2026-10-15 09:48:02.531907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c47d2a9e8b13'
+down_revision: Union[str, None] = '5b1f0c2d7e41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_messages_receiver_status', 'messages', ['receiver_id', 'status'])
+    op.create_index('ix_messages_sender_created', 'messages', ['sender_id', 'created_at'])
+    op.create_index('ix_messages_receiver_created', 'messages', ['receiver_id', 'created_at'])
+    op.create_index(
+        'ix_messages_unread', 'messages', ['receiver_id'],
+        postgresql_where=sa.text("status = 'UNREAD'"),
+        sqlite_where=sa.text("status = 'UNREAD'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_messages_unread', table_name='messages')
+    op.drop_index('ix_messages_receiver_created', table_name='messages')
+    op.drop_index('ix_messages_sender_created', table_name='messages')
+    op.drop_index('ix_messages_receiver_status', table_name='messages')
@@ -0,0 +1,48 @@
+"""add the mv_booking_revenue_month materialized view (Postgres)
+
+Revision ID: d3a7f0c5e914
+Revises: b6d4e1a8c372
+Create Date: 2026-10-15 14:41:09.207316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3a7f0c5e914'
+down_revision: Union[str, None] = 'b6d4e1a8c372'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # SQLite/MySQL have no materialized views; app/analytics.py aggregates
+    # bookings live there
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW mv_booking_revenue_month AS
+        SELECT t.creator_id,
+               date_trunc('month', b.created_at) AS month,
+               SUM(b.total_price) AS revenue,
+               COUNT(*) AS bookings_count
+        FROM bookings b
+        JOIN tours t ON t.id = b.tour_id
+        WHERE b.status = 'confirmed'
+        GROUP BY 1, 2
+        """
+    )
+    # Required by REFRESH ... CONCURRENTLY
+    op.create_index(
+        'ux_mv_booking_revenue_month', 'mv_booking_revenue_month', ['creator_id', 'month'], unique=True
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_booking_revenue_month")
@@ -0,0 +1,51 @@
+"""user flag server defaults and brin index on messages.created_at
+
+Revision ID: e2a94f6c31d8
+Revises: c47d2a9e8b13
+Create Date: 2026-10-15 10:21:17.402865
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a94f6c31d8'
+down_revision: Union[str, None] = 'c47d2a9e8b13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+USER_FLAGS = {
+    'is_active': sa.true(),
+    'is_admin': sa.false(),
+    'is_superadmin': sa.false(),
+    'newsletter_subscribed': sa.false(),
+    'email_verified': sa.false(),
+}
+
+
+def upgrade() -> None:
+    users = sa.table('users', *(sa.column(name) for name in [*USER_FLAGS, 'auth_method']))
+    for name, value in USER_FLAGS.items():
+        op.execute(users.update().where(users.c[name].is_(None)).values({name: value}))
+    op.execute(users.update().where(users.c.auth_method.is_(None)).values(auth_method='email'))
+
+    with op.batch_alter_table('users') as batch_op:
+        for name, value in USER_FLAGS.items():
+            batch_op.alter_column(name, existing_type=sa.Boolean(), nullable=False, server_default=value)
+        batch_op.alter_column('auth_method', existing_type=sa.String(), nullable=False, server_default='email')
+
+    # BRIN on Postgres: tiny for append-only timestamps; plain index elsewhere
+    op.create_index('ix_messages_created_brin', 'messages', ['created_at'], postgresql_using='brin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_messages_created_brin', table_name='messages')
+
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.alter_column('auth_method', existing_type=sa.String(), nullable=True, server_default=None)
+        for name in USER_FLAGS:
+            batch_op.alter_column(name, existing_type=sa.Boolean(), nullable=True, server_default=None)
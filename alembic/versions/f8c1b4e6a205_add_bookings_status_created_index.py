@@ -0,0 +1,31 @@
+"""add bookings(status, created_at) index
+
+Revision ID: f8c1b4e6a205
+Revises: d3a7f0c5e914
+Create Date: 2026-10-15 15:03:52.664170
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f8c1b4e6a205'
+down_revision: Union[str, None] = 'd3a7f0c5e914'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_bookings_status_created', 'bookings', ['status', 'created_at'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_bookings_status_created', table_name='bookings', postgresql_concurrently=True)
@@ -0,0 +1,236 @@
+# app/analytics.py
+"""Admin dashboard figures and the revenue series for the analytics chart.
+
+On Postgres they are read from materialized views, which the arq worker
+refreshes (see app.tasks; `python -m app.analytics` refreshes both by hand):
+
+- mv_admin_tour_stats: booking/review totals per tour, every 5 minutes. The
+  dashboard reads it as is and shows when it was last refreshed.
+- mv_booking_revenue_month: closed months of revenue, daily. Only the current
+  month, which the view lags behind on, is aggregated live.
+
+Other backends aggregate bookings and reviews live. Either way the database
+groups revenue by the chart's own bucket (month, quarter or year).
+"""
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Float, case, column, extract, func, null, select, table, text, true
+from sqlalchemy.orm import Session
+
+from app.database import engine
+from app.models import Booking, Review, Tour
+
+tour_stats_view = table(
+    "mv_admin_tour_stats",
+    column("creator_id"),
+    column("tour_id"),
+    column("bookings"),
+    column("pending"),
+    column("confirmed"),
+    column("revenue"),
+    column("reviews"),
+    *(column(f"r{i}") for i in range(1, 6)),
+    column("refreshed_at"),
+)
+
+revenue_month_view = table(
+    "mv_booking_revenue_month",
+    column("creator_id"),
+    column("month"),
+    column("revenue"),
+    column("bookings_count"),
+)
+
+
+def _is_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def _total(col):
+    return func.coalesce(func.sum(col), 0)
+
+
+def dashboard_totals(db: Session, creator_id: Optional[int] = None):
+    """Booking and review figures for all tours or one operator's, as one row:
+    bookings, pending, confirmed, revenue (confirmed), reviews, average rating,
+    rating_1 .. rating_5 and as_of (when the figures were computed, None when
+    they are live)."""
+    if _is_postgres(db):
+        view = tour_stats_view
+        rating_points = view.c.r1 + 2 * view.c.r2 + 3 * view.c.r3 + 4 * view.c.r4 + 5 * view.c.r5
+        query = select(
+            _total(view.c.bookings).label("bookings"),
+            _total(view.c.pending).label("pending"),
+            _total(view.c.confirmed).label("confirmed"),
+            _total(view.c.revenue).label("revenue"),
+            _total(view.c.reviews).label("reviews"),
+            (func.sum(rating_points).cast(Float) / func.nullif(func.sum(view.c.reviews), 0)).label("average"),
+            *(_total(view.c[f"r{i}"]).label(f"rating_{i}") for i in range(1, 6)),
+            func.max(view.c.refreshed_at).label("as_of"),
+        )
+        if creator_id is not None:
+            query = query.where(view.c.creator_id == creator_id)
+        return db.execute(query).one()
+
+    # Live: each table aggregated in a single scan, the two one-row results
+    # joined side by side. CASE inside the aggregates rather than
+    # FILTER (WHERE ...), which MySQL doesn't support.
+    bookings = select(
+        func.count(Booking.id).label("bookings"),
+        func.count(case((Booking.status == "pending", Booking.id))).label("pending"),
+        func.count(case((Booking.status == "confirmed", Booking.id))).label("confirmed"),
+        func.coalesce(func.sum(case((Booking.status == "confirmed", Booking.total_price))), 0).label("revenue"),
+    )
+    reviews = select(
+        func.count(Review.id).label("reviews"),
+        func.avg(Review.rating).label("average"),
+        *(func.count(case((Review.rating == i, Review.id))).label(f"rating_{i}") for i in range(1, 6)),
+    )
+    if creator_id is not None:
+        bookings = bookings.where(Booking.creator_id == creator_id)
+        reviews = reviews.where(Review.creator_id == creator_id)
+    bookings, reviews = bookings.subquery(), reviews.subquery()
+    return db.execute(
+        select(bookings, reviews, null().label("as_of")).select_from(bookings.join(reviews, true()))
+    ).one()
+
+
+def top_tours(db: Session, creator_id: Optional[int] = None, limit: int = 5) -> List[dict]:
+    """Tours with the most confirmed revenue: title, revenue and image."""
+    if _is_postgres(db):
+        view = tour_stats_view
+        revenue = view.c.revenue
+        query = select(Tour.title, Tour.primary_image_url, revenue).join(
+            view, view.c.tour_id == Tour.id
+        ).where(view.c.confirmed > 0)
+        if creator_id is not None:
+            query = query.where(view.c.creator_id == creator_id)
+    else:
+        revenue = func.sum(Booking.total_price).label("revenue")
+        query = select(Tour.title, Tour.primary_image_url, revenue).join(
+            Booking, Booking.tour_id == Tour.id
+        ).where(Booking.status == "confirmed").group_by(Tour.id)
+        if creator_id is not None:
+            query = query.where(Booking.creator_id == creator_id)
+    rows = db.execute(query.order_by(revenue.desc()).limit(limit))
+    return [{"title": title, "revenue": amount or 0, "image": image} for title, image, amount in rows]
+
+
+def _month_start(year: int, month: int) -> datetime:
+    return datetime(year, month, 1)
+
+
+def _shift_month(year: int, month: int, delta: int) -> Tuple[int, int]:
+    year, index = divmod(year * 12 + month - 1 + delta, 12)
+    return year, index + 1
+
+
+def _bucket_columns(grain: str, timestamp) -> list:
+    """GROUP BY expressions for a bucket: (year,), (year, quarter) or
+    (year, month). Quarters are derived from the month with CASE because
+    SQLite has no EXTRACT(quarter)."""
+    year, month = extract("year", timestamp), extract("month", timestamp)
+    if grain == "year":
+        return [year]
+    if grain == "quarter":
+        return [year, case((month <= 3, 1), (month <= 6, 2), (month <= 9, 3), else_=4)]
+    return [year, month]
+
+
+def revenue_by(db: Session, grain: str, since: datetime, creator_id: Optional[int] = None) -> Dict[Tuple[int, ...], float]:
+    """Confirmed revenue per bucket of `grain` (see _bucket_columns) for
+    bookings created from `since` (the first of a month) on, for all tours or
+    one operator's."""
+    revenue: Dict[Tuple[int, ...], float] = {}
+    live_since = since
+
+    def add(rows) -> None:
+        # The current quarter/year gets both view and live rows
+        for *key, amount in rows:
+            key = tuple(int(part) for part in key)
+            revenue[key] = revenue.get(key, 0.0) + float(amount or 0)
+
+    if _is_postgres(db):
+        now = datetime.utcnow()
+        this_month = _month_start(now.year, now.month)
+        view = revenue_month_view
+        buckets = _bucket_columns(grain, view.c.month)
+        query = select(*buckets, func.sum(view.c.revenue)).where(
+            view.c.month >= since, view.c.month < this_month
+        ).group_by(*buckets)
+        if creator_id is not None:
+            query = query.where(view.c.creator_id == creator_id)
+        add(db.execute(query))
+        live_since = max(since, this_month)
+
+    # Range predicate on created_at, so ix_bookings_status_created serves it
+    buckets = _bucket_columns(grain, Booking.created_at)
+    query = select(*buckets, func.sum(Booking.total_price)).where(
+        Booking.status == "confirmed", Booking.created_at >= live_since
+    ).group_by(*buckets)
+    if creator_id is not None:
+        query = query.where(Booking.creator_id == creator_id)
+    add(db.execute(query))
+    return revenue
+
+
+@lru_cache(maxsize=8)
+def _chart_buckets(period: str, year: int, month: int) -> Tuple[str, datetime, Tuple[Tuple[str, Tuple[int, ...]], ...]]:
+    """(grain, since, ((label, bucket key), ...)) for a chart period as of
+    the given month. Only changes when the month does, so it is memoized."""
+    if period == "monthly":
+        buckets = []
+        for i in range(11, -1, -1):
+            y, m = _shift_month(year, month, -i)
+            buckets.append((_month_start(y, m).strftime("%b %Y"), (y, m)))
+        return "month", _month_start(*buckets[0][1]), tuple(buckets)
+    if period == "quarterly":
+        buckets = []
+        quarter_start = month - (month - 1) % 3
+        for i in range(3, -1, -1):
+            y, m = _shift_month(year, quarter_start, -3 * i)
+            quarter = (m - 1) // 3 + 1
+            buckets.append((f"Q{quarter} {y}", (y, quarter)))
+        return "quarter", _month_start(*_shift_month(year, quarter_start, -9)), tuple(buckets)
+    # yearly
+    buckets = tuple((str(y), (y,)) for y in range(year - 4, year + 1))
+    return "year", _month_start(year - 4, 1), buckets
+
+
+def revenue_series(db: Session, period: str, creator_id: Optional[int] = None) -> Tuple[List[str], List[float]]:
+    """Chart labels and values, oldest first: the last 12 months ("monthly"),
+    the last 4 quarters ("quarterly") or otherwise the last 5 years."""
+    now = datetime.utcnow()
+    if period not in ("monthly", "quarterly"):
+        period = "yearly"
+    grain, since, buckets = _chart_buckets(period, now.year, now.month)
+
+    revenue = revenue_by(db, grain, since, creator_id)
+    labels = [label for label, _ in buckets]
+    data = [revenue.get(key, 0.0) for _, key in buckets]
+    return labels, data
+
+
+def refresh_view(name: str) -> None:
+    """Rebuild one of the materialized views (Postgres only). CONCURRENTLY
+    keeps the view readable meanwhile; it needs the unique index and cannot
+    run inside a transaction."""
+    if engine.dialect.name != "postgresql":
+        return
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {name}"))
+
+
+def refresh_tour_stats_view() -> None:
+    refresh_view(tour_stats_view.name)
+
+
+def refresh_revenue_view() -> None:
+    refresh_view(revenue_month_view.name)
+
+
+if __name__ == "__main__":
+    refresh_tour_stats_view()
+    refresh_revenue_view()
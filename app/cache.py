@@ -0,0 +1,110 @@
+# app/cache.py
+import uuid
+from typing import Optional
+
+from dogpile.cache import make_region
+
+from app.config import get_settings
+
+settings = get_settings()
+
+# Tour data shared by every worker and replica when REDIS_URL is set, so a
+# cold cache costs one query per key instead of one per worker. Without Redis
+# (local development, tests) each process keeps its own memory cache.
+tour_cache = make_region(name="tours")
+# Per-operator dashboard figures (stats overview, revenue chart), which admins
+# re-fetch on every dashboard refresh
+stats_cache = make_region(name="stats")
+# Rendered dashboard pages. Invalidation retires them rather than deleting
+# them (see dashboard_page_key), so they need a store that evicts on its own
+page_cache = make_region(name="pages")
+
+
+def _configure(region, expiration_time: int) -> None:
+    if settings.redis_url:
+        region.configure(
+            "dogpile.cache.redis",
+            # Soft expiry: once expiration_time has passed, one worker
+            # regenerates a key under the distributed lock while the others
+            # keep serving the old value, which Redis holds for a while longer.
+            expiration_time=expiration_time,
+            arguments={
+                "url": settings.redis_url,
+                "redis_expiration_time": expiration_time * 5,
+                "distributed_lock": True,
+            },
+        )
+    else:
+        region.configure("dogpile.cache.memory", expiration_time=expiration_time)
+
+
+_configure(tour_cache, 60 if settings.redis_url else 30)
+_configure(stats_cache, 30)
+if settings.redis_url:
+    _configure(page_cache, 30)
+else:
+    # The memory backend is a plain dict that never evicts, and every
+    # invalidation would leave a whole page behind in it: render each time.
+    page_cache.configure("dogpile.cache.null")
+
+STATS_ENDPOINTS = ("overview", "revenue|monthly", "revenue|quarterly", "revenue|yearly")
+
+
+def dashboard_tours_key(creator_id: Optional[int] = None) -> str:
+    """Dashboard tour cards of one operator, or of every operator (None)."""
+    return f"dashboard-tours|{'all' if creator_id is None else creator_id}"
+
+
+def tour_key(tour_id: int) -> str:
+    return f"tour|{tour_id}"
+
+
+def invalidate_tour(tour_id: int, creator_id: Optional[int]) -> None:
+    """Drop every cached entry a change to this tour can affect. Call it
+    after the commit, so concurrent readers can't re-cache the old rows."""
+    keys = {tour_key(tour_id), dashboard_tours_key(None)}
+    if creator_id is not None:
+        keys.add(dashboard_tours_key(creator_id))
+    tour_cache.delete_multi(sorted(keys))
+    stats_cache.delete_multi(sorted(_generation_keys(creator_id)))
+
+
+def stats_key(creator_id: Optional[int], endpoint: str) -> str:
+    """One operator's figures, or everyone's (None): superadmins share them."""
+    return f"stats|{'all' if creator_id is None else creator_id}|{endpoint}"
+
+
+def invalidate_stats(*creator_ids: Optional[int]) -> None:
+    """Bookings, reviews or tours of these operators changed."""
+    keys = {stats_key(None, endpoint) for endpoint in STATS_ENDPOINTS}
+    keys.update(
+        stats_key(creator_id, endpoint)
+        for creator_id in creator_ids
+        if creator_id is not None
+        for endpoint in STATS_ENDPOINTS
+    )
+    keys.update(_generation_keys(*creator_ids))
+    stats_cache.delete_multi(sorted(keys))
+
+
+# Rendered dashboard pages are per user (the page shows their profile) but
+# their data is per operator. Page keys embed a generation token of the
+# operator's data (or everyone's, for superadmins); invalidating drops the
+# token, so every page built on the old data stops being looked up at once.
+
+def _generation_key(creator_id: Optional[int]) -> str:
+    return f"dashboard-generation|{'all' if creator_id is None else creator_id}"
+
+
+def _generation_keys(*creator_ids: Optional[int]) -> set:
+    return {_generation_key(None)} | {
+        _generation_key(creator_id) for creator_id in creator_ids if creator_id is not None
+    }
+
+
+def dashboard_page_key(user_id: int, creator_id: Optional[int], variant: str) -> str:
+    """A user's rendered dashboard over the current data of one operator, or
+    of every operator (None). `variant` covers whatever else the page shows
+    (profile fields, flash messages)."""
+    generation = stats_cache.get_or_create(_generation_key(creator_id), lambda: uuid.uuid4().hex)
+    return f"dashboard-page|{user_id}|{generation}|{variant}"
@@ -0,0 +1,44 @@
+# app/config.py
+import os
+import secrets
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def _env_flag(name: str) -> bool:
+    # start.sh exports DEBUG="False", so parse the value instead of using bool()
+    return os.getenv(name, "").lower() in ("1", "true", "yes")
+
+
+def _env_int(name: str) -> Optional[int]:
+    value = os.getenv(name)
+    return int(value) if value else None
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Environment configuration, read once per process (see get_settings)."""
+
+    database_url: str = field(default_factory=lambda: os.getenv("DATABASE_URL", "sqlite:///./test.db"))
+    # Without SECRET_KEY every process signs cookies with its own random key,
+    # so set it anywhere more than one worker serves requests.
+    session_secret: str = field(default_factory=lambda: os.getenv("SECRET_KEY") or secrets.token_urlsafe(32))
+    debug: bool = field(default_factory=lambda: _env_flag("DEBUG"))
+    dev_auto_migrate: bool = field(default_factory=lambda: _env_flag("DEV_AUTO_MIGRATE"))
+    # Dev/CI: fail requests that lazy-load the same relationship in a loop
+    nplusone_raise: bool = field(default_factory=lambda: _env_flag("NPLUSONE_RAISE"))
+    # Optional overrides for the per-backend pool defaults in app/database.py
+    db_pool_size: Optional[int] = field(default_factory=lambda: _env_int("DB_POOL_SIZE"))
+    db_max_overflow: Optional[int] = field(default_factory=lambda: _env_int("DB_MAX_OVERFLOW"))
+    # Shared tour cache (app/cache.py); unset means a per-process memory cache
+    redis_url: Optional[str] = field(default_factory=lambda: os.getenv("REDIS_URL") or None)
+
+
+@lru_cache
+def get_settings() -> Settings:
+    return Settings()
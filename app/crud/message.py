@@ -1,6 +1,9 @@
-from sqlalchemy.orm import Session
+from collections import Counter
+from sqlalchemy import select, insert, update, delete, or_, and_, case, func
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session, aliased
 from typing import List, Optional
-from app.models import Message, MessageStatus
+from app.models import Message, MessageStatus, User, Booking, Tour
 from app.schemas.message import MessageCreate
 
 
@@ -8,6 +11,16 @@ class MessageCRUD:
     def __init__(self, db: Session):
         self.db = db
 
+    def _adjust_unread(self, user_id: int, delta: int) -> None:
+        # Relative UPDATE in the caller's transaction, so concurrent writers
+        # never overwrite each other's counts
+        if delta:
+            self.db.execute(
+                update(User)
+                .where(User.id == user_id)
+                .values(unread_count=User.unread_count + delta)
+            )
+
     def create(self, sender_id: int, message: MessageCreate) -> Message:
         db_message = Message(
             sender_id=sender_id,
@@ -19,46 +32,106 @@ class MessageCRUD:
             status=MessageStatus.UNREAD
         )
         self.db.add(db_message)
+        self._adjust_unread(message.receiver_id, 1)
         self.db.commit()
         self.db.refresh(db_message)
         return db_message
 
-    def get_message(self, message_id: int) -> Optional[Message]:
-        return self.db.query(Message).filter(Message.id == message_id).first()
+    def create_many(self, sender_id: int, messages: List[MessageCreate]) -> List[int]:
+        # One batched INSERT ... RETURNING for the whole list instead of a
+        # commit round trip per message; returns the new ids in input order.
+        if not messages:
+            return []
+        ids = self.db.scalars(
+            insert(Message).returning(Message.id, sort_by_parameter_order=True),
+            [
+                dict(sender_id=sender_id, status=MessageStatus.UNREAD, **message.model_dump())
+                for message in messages
+            ],
+        ).all()
+        for receiver_id, count in Counter(m.receiver_id for m in messages).items():
+            self._adjust_unread(receiver_id, count)
+        self.db.commit()
+        return ids
 
-    def get_user_messages(self, user_id: int, skip: int = 0, limit: int = 100) -> List[Message]:
+    def get_message(self, message_id: int) -> Optional[Message]:
+        # Identity-map hit when the message is already in the session
+        return self.db.get(Message, message_id)
+
+    @staticmethod
+    def _named_messages():
+        # Plain rows: only the columns the API returns, with participant
+        # names joined in, so no ORM instances or follow-up user queries
+        # are needed.
+        sender = aliased(User)
+        receiver = aliased(User)
         return (
-            self.db.query(Message)
-            .filter((Message.sender_id == user_id) | (Message.receiver_id == user_id))
+            select(
+                Message.id,
+                Message.sender_id,
+                Message.receiver_id,
+                Message.booking_id,
+                Message.parent_message_id,
+                Message.subject,
+                Message.content,
+                Message.status,
+                Message.created_at,
+                Message.updated_at,
+                func.coalesce(func.nullif(sender.full_name, ""), sender.email).label("sender_name"),
+                func.coalesce(func.nullif(receiver.full_name, ""), receiver.email).label("receiver_name"),
+            )
+            .join(sender, sender.id == Message.sender_id)
+            .join(receiver, receiver.id == Message.receiver_id)
+        )
+
+    def get_user_messages(self, user_id: int, skip: int = 0, limit: int = 100) -> List[Row]:
+        return self.db.execute(
+            self._named_messages()
+            .where(or_(Message.sender_id == user_id, Message.receiver_id == user_id))
             .order_by(Message.created_at.desc())
             .offset(skip)
             .limit(limit)
-            .all()
-        )
-
-    def get_conversation(self, user1_id: int, user2_id: int, booking_id: Optional[int] = None) -> List[Message]:
-        query = self.db.query(Message).filter(
-            ((Message.sender_id == user1_id) & (Message.receiver_id == user2_id)) |
-            ((Message.sender_id == user2_id) & (Message.receiver_id == user1_id))
+        ).all()
+
+    def get_conversation(self, user1_id: int, user2_id: int, booking_id: Optional[int] = None) -> List[Row]:
+        query = self._named_messages().where(
+            or_(
+                and_(Message.sender_id == user1_id, Message.receiver_id == user2_id),
+                and_(Message.sender_id == user2_id, Message.receiver_id == user1_id),
+            )
         )
 
         if booking_id:
-            query = query.filter(Message.booking_id == booking_id)
+            query = query.where(Message.booking_id == booking_id)
 
-        return query.order_by(Message.created_at.asc()).all()
+        return self.db.execute(query.order_by(Message.created_at.asc())).all()
 
     def get_unread_count(self, user_id: int) -> int:
-        return self.db.query(Message).filter(
-            Message.receiver_id == user_id,
-            Message.status == MessageStatus.UNREAD
-        ).count()
-
-    def mark_as_read(self, message_id: int, user_id: int) -> Optional[Message]:
-        message = self.get_message(message_id)
-        if message and message.receiver_id == user_id:
-            message.status = MessageStatus.READ
-            self.db.commit()
-            self.db.refresh(message)
+        # Primary-key lookup of the maintained counter instead of a COUNT(*)
+        return self.db.scalar(select(User.unread_count).where(User.id == user_id)) or 0
+
+    def mark_as_read(self, message_id: int, user_id: int) -> Optional[Row]:
+        # UPDATE ... RETURNING guarded on the receiver instead of SELECT +
+        # UPDATE + refresh, then the updated row with participant names in
+        # one joined read. Returns a plain row (not an ORM instance) so the
+        # values are still available after commit() expires the session.
+        stmt = (
+            update(Message)
+            .where(Message.id == message_id, Message.receiver_id == user_id)
+            .values(status=MessageStatus.READ)
+            .returning(Message.id)
+        )
+        # Only an UNREAD -> READ transition moves the counter; the row lock
+        # taken by this UPDATE keeps concurrent calls from both decrementing.
+        updated = self.db.execute(stmt.where(Message.status == MessageStatus.UNREAD)).scalar_one_or_none()
+        if updated is not None:
+            self._adjust_unread(user_id, -1)
+        else:
+            updated = self.db.execute(stmt).scalar_one_or_none()
+        message = None
+        if updated is not None:
+            message = self.db.execute(self._named_messages().where(Message.id == updated)).one()
+        self.db.commit()
         return message
 
     def mark_conversation_as_read(self, user1_id: int, user2_id: int) -> int:
@@ -66,28 +139,83 @@ class MessageCRUD:
             Message.receiver_id == user1_id,
             Message.sender_id == user2_id,
             Message.status == MessageStatus.UNREAD
-        ).update({Message.status: MessageStatus.READ})
+        ).update({Message.status: MessageStatus.READ}, synchronize_session=False)
+        self._adjust_unread(user1_id, -updated)
         self.db.commit()
         return updated
 
-    # ✅ FIXED: Properly indented inside class
     def get_conversations(self, user_id: int) -> List[int]:
-        sent = self.db.query(Message.receiver_id).filter(
-            Message.sender_id == user_id
+        # One pass over the user's messages, grouped by the other participant
+        other_id = case(
+            (Message.sender_id == user_id, Message.receiver_id),
+            else_=Message.sender_id
+        ).label("other_id")
+
+        return self.db.execute(
+            select(other_id)
+            .where(or_(Message.sender_id == user_id, Message.receiver_id == user_id))
+            .group_by(other_id)
+        ).scalars().all()
+
+    def get_inbox(self, user_id: int) -> List[Row]:
+        """One row per conversation partner: the latest message, the unread
+        count and the first booking mentioned, in a single query.
+
+        Uses window functions over the user's messages rather than a LATERAL
+        join so the same statement runs on SQLite and MySQL as well.
+        """
+        other_id = case(
+            (Message.sender_id == user_id, Message.receiver_id),
+            else_=Message.sender_id
         )
-
-        received = self.db.query(Message.sender_id).filter(
-            Message.receiver_id == user_id
+        latest_first = (Message.created_at.desc(), Message.id.desc())
+        threads = (
+            select(
+                other_id.label("other_id"),
+                Message.content,
+                Message.created_at,
+                func.row_number().over(partition_by=other_id, order_by=latest_first).label("rn"),
+                func.sum(
+                    case(
+                        (and_(Message.receiver_id == user_id, Message.status == MessageStatus.UNREAD), 1),
+                        else_=0
+                    )
+                ).over(partition_by=other_id).label("unread_count"),
+                func.first_value(Message.booking_id).over(
+                    partition_by=other_id,
+                    order_by=(Message.booking_id.is_(None), Message.created_at, Message.id)
+                ).label("booking_id"),
+            )
+            .where(or_(Message.sender_id == user_id, Message.receiver_id == user_id))
+            .subquery()
         )
 
-        result = sent.union(received).distinct().all()
-
-        return [r[0] for r in result]
+        return self.db.execute(
+            select(
+                User,
+                threads.c.content.label("last_message"),
+                threads.c.created_at.label("last_message_time"),
+                threads.c.unread_count,
+                threads.c.booking_id,
+                Tour.title.label("booking_title"),
+            )
+            .join(User, User.id == threads.c.other_id)
+            .outerjoin(Booking, Booking.id == threads.c.booking_id)
+            .outerjoin(Tour, Tour.id == Booking.tour_id)
+            .where(threads.c.rn == 1)
+            .order_by(threads.c.created_at.desc())
+        ).all()
 
     def delete_message(self, message_id: int, user_id: int) -> bool:
-        message = self.get_message(message_id)
-        if message and (message.sender_id == user_id or message.receiver_id == user_id):
-            self.db.delete(message)
-            self.db.commit()
-            return True
-        return False
+        deleted = self.db.execute(
+            delete(Message)
+            .where(
+                Message.id == message_id,
+                or_(Message.sender_id == user_id, Message.receiver_id == user_id)
+            )
+            .returning(Message.receiver_id, Message.status)
+        ).one_or_none()
+        if deleted is not None and deleted.status == MessageStatus.UNREAD:
+            self._adjust_unread(deleted.receiver_id, -1)
+        self.db.commit()
+        return deleted is not None
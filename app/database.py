@@ -1,26 +1,181 @@
 # app/database.py
-from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base
-from sqlalchemy.orm import sessionmaker
-import os
-
-#DATABASE_URL = os.getenv("DATABASE_URL")
-DATABASE_URL = "sqlite:///./test.db"  # Use SQLite for simplicity
- 
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy.pool import QueuePool
+from contextvars import ContextVar
+from typing import Optional
+import threading
+
+from app.config import get_settings
+
+settings = get_settings()
+DATABASE_URL = settings.database_url  # SQLite for local development
+
+
+# Supabase's transaction-mode pooler (PgBouncer) listens on 6543; the session
+# pooler and direct connections use 5432.
+TRANSACTION_POOLER_PORT = 6543
+
+
+def _engine_options(url: str, pool_size: Optional[int] = None, max_overflow: Optional[int] = None) -> dict:
+    """Pool/connection settings for the configured backend."""
+    db_url = make_url(url)
+    backend = db_url.get_backend_name()
+    if backend == "sqlite":
+        return {"pool_pre_ping": True}
+
+    if backend != "postgresql":
+        # MySQL (docker-compose): one QueuePool per process, recycled well
+        # inside the server's wait_timeout
+        options = {
+            "pool_size": 10,
+            "max_overflow": 20,
+            "pool_pre_ping": True,
+            "pool_recycle": 1800,
+        }
+    else:
+        options = _postgres_options(db_url)
+
+    if pool_size is not None:
+        options["pool_size"] = pool_size
+    if max_overflow is not None:
+        options["max_overflow"] = max_overflow
+    return options
+
+
+def _postgres_options(db_url) -> dict:
+    """Supabase: pool sizes stay small because every process shares the
+    project's connection limit."""
+    options = {
+        "poolclass": QueuePool,
+        "pool_timeout": 30,
+        "isolation_level": "READ COMMITTED",
+        "connect_args": {"options": "-c statement_timeout=30000"},
+    }
+
+    if db_url.port == TRANSACTION_POOLER_PORT:
+        # Transaction mode strips session state between statements and the
+        # pre-ping SELECT 1 leaves the backend "idle in transaction", so
+        # recycle connections instead of pinging them. psycopg2 never issues
+        # server-side prepared statements, so nothing has to be disabled on
+        # the driver side. Prefer the session pooler (5432) where possible.
+        options.update(pool_size=10, max_overflow=5, pool_recycle=60, pool_pre_ping=False)
+    else:
+        # Session pooler / direct connection: each pooled connection keeps its
+        # backend, so pre-ping is safe and connections can live much longer.
+        options.update(pool_size=3, max_overflow=2, pool_recycle=1800, pool_pre_ping=True)
+    return options
+
+
+# Created once at import and shared by every session in the process; never
+# build engines per request.
 engine = create_engine(
     DATABASE_URL,
-    pool_pre_ping=True,
+    # The compiled cache is client-side (SQL string per statement shape), so it
+    # helps behind PgBouncer too; size it above the default 500 so the admin
+    # and messaging query variants don't evict each other.
+    query_cache_size=1200,
+    # Rows per batch when executemany() INSERTs are rewritten into multi-row
+    # INSERT ... VALUES (...), (...) statements.
+    insertmanyvalues_page_size=1000,
+    **_engine_options(DATABASE_URL, settings.db_pool_size, settings.db_max_overflow),
 )
 
-SessionLocal = sessionmaker(
-    autocommit=False,
-    autoflush=False,
-    bind=engine,
+if engine.dialect.name == "sqlite":
+    # SQLite ignores foreign keys (and their ON DELETE actions) unless asked
+    @event.listens_for(engine, "connect")
+    def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
+def warm_pool() -> None:
+    """Open the pool's steady-state connections up front so the first requests
+    after a deploy don't pay connect/TLS and dialect initialisation."""
+    size = engine.pool.size() if hasattr(engine.pool, "size") else 1
+    connections = []
+    try:
+        for _ in range(max(size, 1)):
+            conn = engine.connect()
+            connections.append(conn)
+            conn.execute(text("SELECT 1"))
+    finally:
+        # Returned to the pool, not closed: they stay checked in and ready
+        for conn in connections:
+            conn.close()
+
+
+# Async endpoints all run on the event loop thread, so a plain thread-local
+# scope would hand concurrent requests the same session. DBSessionMiddleware
+# gives every request its own scope key instead; code running outside a
+# request (scripts, tests) falls back to one session per thread.
+_request_scope: ContextVar = ContextVar("db_request_scope", default=None)
+
+
+def _session_scope():
+    scope = _request_scope.get()
+    return scope if scope is not None else threading.get_ident()
+
+
+SessionLocal = scoped_session(
+    sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        bind=engine,
+    ),
+    scopefunc=_session_scope,
 )
 
+def raise_on_repeated_lazy_loads(session_factory) -> None:
+    """Dev/CI guard against N+1 queries.
+
+    A relationship lazy-loaded for a second instance within one session means
+    a loop is touching it row by row (typically a template); raise instead so
+    the missing selectinload/joinedload shows up in tests.
+    """
+
+    @event.listens_for(session_factory, "do_orm_execute")
+    def _check_lazy_load(orm_execute_state):
+        if not (orm_execute_state.is_relationship_load and orm_execute_state.lazy_loaded_from):
+            return
+        relationship = str(orm_execute_state.loader_strategy_path[-1])
+        seen = orm_execute_state.session.info.setdefault("lazy_loaded", set())
+        if relationship in seen:
+            raise RuntimeError(
+                f"N+1 query: {relationship} lazy-loaded for more than one instance; "
+                "eager-load it with selectinload()/joinedload()"
+            )
+        seen.add(relationship)
+
+
+if settings.nplusone_raise:
+    raise_on_repeated_lazy_loads(SessionLocal.session_factory)
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
+        SessionLocal.remove()
+
+
+class DBSessionMiddleware:
+    """Opens a session scope per request and always removes it at the end."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = _request_scope.set(object())
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            SessionLocal.remove()
+            _request_scope.reset(token)
@@ -0,0 +1,82 @@
+# app/images.py
+# Post-upload image processing: uploads are stored as sent and re-encoded to
+# resized WebP in the background, off the request path.
+
+import asyncio
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from PIL import Image, ImageOps
+from sqlalchemy import update
+
+from app.database import SessionLocal
+from app.models import TourImage
+
+logger = logging.getLogger(__name__)
+
+MAX_DIMENSION = 1600
+WEBP_QUALITY = 80
+# Animated GIFs would lose their frames; WebP is already the target format
+SKIP_EXTENSIONS = {".gif", ".webp"}
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    # Encoding is CPU bound, so use processes (not the threadpool) and create
+    # them on first use rather than at import in every worker
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1)
+    return _pool
+
+
+def transcode_to_webp(path: str) -> Optional[str]:
+    """Write a resized WebP copy next to path; return its path, or None if
+    the file is skipped or can't be decoded."""
+    root, ext = os.path.splitext(path)
+    if ext.lower() in SKIP_EXTENSIONS:
+        return None
+    webp_path = f"{root}.webp"
+    try:
+        with Image.open(path) as img:
+            img = ImageOps.exif_transpose(img)
+            img.thumbnail((MAX_DIMENSION, MAX_DIMENSION))
+            if img.mode not in ("RGB", "RGBA"):
+                img = img.convert("RGBA" if "A" in img.getbands() else "RGB")
+            img.save(webp_path, "WEBP", quality=WEBP_QUALITY, method=4)
+    except Exception:
+        logger.exception("Could not transcode %s, keeping the original", path)
+        return None
+    return webp_path
+
+
+async def transcode_tour_images(image_urls: List[str]) -> Dict[str, str]:
+    """Re-encode uploaded tour images and point their rows at the WebP files.
+
+    Returns {original url: webp url} for the images that were converted; the
+    originals are left on disk for the caller to remove.
+    """
+    loop = asyncio.get_running_loop()
+    pool = _get_pool()
+    results = await asyncio.gather(*(
+        loop.run_in_executor(pool, transcode_to_webp, url.lstrip("/"))
+        for url in image_urls
+    ))
+    converted = {url: f"/{webp}" for url, webp in zip(image_urls, results) if webp}
+    if not converted:
+        return converted
+
+    # Own session: this runs after the request's session has been removed
+    with SessionLocal.session_factory() as db:
+        for url, webp_url in converted.items():
+            db.execute(
+                update(TourImage)
+                .where(TourImage.image_url == url)
+                .values(image_url=webp_url)
+                .execution_options(synchronize_session=False)
+            )
+        db.commit()
+    return converted
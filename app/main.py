@@ -1,10 +1,9 @@
 # app/main.py
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
 from starlette.middleware.sessions import SessionMiddleware
-import os
 
 from app.routes import (
     auth,
@@ -24,22 +23,53 @@ from app.routes import (
     users
 )
 
-from app.database import engine
+from app.config import get_settings
+from app.database import engine, warm_pool, DBSessionMiddleware
+from app.templating import warm_templates
+from app.tasks import connect_queue
 from app.models import Base
 
-app = FastAPI(debug=True)
+settings = get_settings()
 
-# Static files & templates
+app = FastAPI(debug=settings.debug)
+
+# Static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
-templates = Jinja2Templates(directory="app/templates")
-templates.env.auto_reload = True
 
 # Middleware
 app.add_middleware(
     SessionMiddleware,
-    secret_key="your_secret_key",  # move to .env later
+    secret_key=settings.session_secret,
     session_cookie="session_id",
 )
+app.add_middleware(DBSessionMiddleware)
+
+# One error envelope for unhandled exceptions, so endpoints don't each wrap
+# their body in try/except and echo str(e) to the client. Starlette re-raises
+# the exception after this response, so the server still logs the traceback.
+@app.exception_handler(Exception)
+async def internal_error(request: Request, exc: Exception):
+    return ORJSONResponse({"detail": "internal error"}, status_code=500)
+
+@app.on_event("startup")
+def warm_database_pool():
+    warm_pool()
+
+@app.on_event("startup")
+def warm_template_cache():
+    warm_templates()
+
+# arq job queue (None without Redis, see app.tasks)
+app.state.task_queue = None
+
+@app.on_event("startup")
+async def open_task_queue():
+    app.state.task_queue = await connect_queue()
+
+@app.on_event("shutdown")
+async def close_task_queue():
+    if app.state.task_queue is not None:
+        await app.state.task_queue.aclose()
 
 # Routes
 app.include_router(auth.router)
@@ -58,5 +88,8 @@ app.include_router(messaging.router)
 app.include_router(messaging_views.router)
 app.include_router(users.router)
 
-
-Base.metadata.create_all(bind=engine)  # Create tables if they don't exist
+# Schema is managed by Alembic (`alembic upgrade head` on deploy). Creating the
+# tables at import time costs a round of catalog queries on every worker boot,
+# so it is only kept as an opt-in shortcut for local development.
+if settings.dev_auto_migrate:
+    Base.metadata.create_all(bind=engine)
@@ -1,11 +1,18 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Float, ForeignKey, Text, Enum
-from sqlalchemy.orm import relationship
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Float, ForeignKey, Text, Enum, Index, text, true, false, case, select, update, event
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.hybrid import hybrid_method
+from sqlalchemy.orm import relationship, declarative_base, column_property
+from sqlalchemy.orm.attributes import get_history
 import uuid
 from datetime import datetime
 import enum
 Base = declarative_base()
 
+# Native 16-byte uuid on Postgres (where the migration also adds a
+# gen_random_uuid() server default); 36-char strings on SQLite/MySQL. Values
+# are always handled as str in Python.
+UUIDString = String(36).with_variant(UUID(as_uuid=False), "postgresql")
+
         
 class UserRole(str, enum.Enum):
     customer = "customer"
@@ -18,31 +25,34 @@ class User(Base):
     email = Column(String(100), unique=True, index=True)
     hashed_password = Column(String(200))
     full_name = Column(String(100))
-    is_active = Column(Boolean, default=True)
-    is_admin = Column(Boolean, default=False)
+    is_active = Column(Boolean, nullable=False, server_default=true())
+    is_admin = Column(Boolean, nullable=False, server_default=false())
     phone = Column(String(50), nullable=True)
     bio = Column(Text, nullable=True)
-    is_superadmin = Column(Boolean, default=False)
-    newsletter_subscribed = Column(Boolean, default=False)
-    unsubscribe_token = Column(String(36), default=lambda: str(uuid.uuid4()))
+    is_superadmin = Column(Boolean, nullable=False, server_default=false())
+    newsletter_subscribed = Column(Boolean, nullable=False, server_default=false())
+    unsubscribe_token = Column(UUIDString, default=lambda: str(uuid.uuid4()))
     company_name = Column(String(100), nullable=True)
     company_link = Column(String(200), nullable=True)
     picture = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
-    role = Column(Enum(UserRole), default=UserRole.customer, nullable=False)
 
     # Add OAuth fields
     google_id = Column(String(255), unique=True, index=True, nullable=True)
     apple_id = Column(String(255), unique=True, index=True, nullable=True)
-    email_verified = Column(Boolean, default=False)
+    email_verified = Column(Boolean, nullable=False, server_default=false())
     
     # Track auth method
-    auth_method = Column(String, default="email")
+    auth_method = Column(String, nullable=False, server_default="email")
+
+    # Inbox badge counter, kept in step with messages by MessageCRUD and,
+    # for ORM (cascade) deletes, by _release_unread below
+    unread_count = Column(Integer, nullable=False, server_default="0")
     
     # Relationships
     created_tours = relationship("Tour", back_populates="creator")
-    bookings = relationship("Booking", back_populates="user")
-    reviews = relationship("Review", back_populates="user")
+    bookings = relationship("Booking", back_populates="user", foreign_keys="Booking.user_id")
+    reviews = relationship("Review", back_populates="user", foreign_keys="Review.user_id")
     
     sent_messages = relationship(
         "Message",
@@ -56,7 +66,7 @@ class User(Base):
         back_populates="receiver",
         cascade="all, delete-orphan"
     )
-    #property
+    # Derived from the flags above; there is no role column
     @property
     def role(self) -> str:
         if self.is_superadmin:
@@ -70,7 +80,7 @@ class User(Base):
 
 class Session(Base):
     __tablename__ = "sessions"
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(UUIDString, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(Integer, index=True)
     expires_at = Column(DateTime)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -98,20 +108,37 @@ class Tour(Base):
     creator_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     
     # Relationships
-    images = relationship("TourImage", back_populates="tour", cascade="all, delete-orphan")
+    # The FK cascades, so deleting a tour doesn't load its images first
+    images = relationship("TourImage", back_populates="tour", cascade="all, delete-orphan", passive_deletes=True)
     creator = relationship("User", back_populates="created_tours")
     bookings = relationship("Booking", back_populates="tour", cascade="all, delete-orphan")
     reviews = relationship("Review", back_populates="tour", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # operator dashboard / tour lists: creator_id = ? [AND is_active]
+        Index("ix_tours_creator_active", "creator_id", "is_active"),
+    )
+
+    PRIVATE_SURCHARGE = 1.35
+
+    @hybrid_method
     def calculate_price(self, adults: int, kids: int, is_private: bool = False) -> float:
         base_price = (adults + kids) * self.price
-        return base_price * 1.35 if is_private else base_price
+        return base_price * self.PRIVATE_SURCHARGE if is_private else base_price
+
+    @calculate_price.expression
+    def calculate_price(cls, adults, kids, is_private=False):
+        # SQL form, e.g. func.sum(Tour.calculate_price(Booking.adults, Booking.kids, Booking.is_private))
+        base_price = (adults + kids) * cls.price
+        if isinstance(is_private, bool):
+            return base_price * cls.PRIVATE_SURCHARGE if is_private else base_price
+        return case((is_private, base_price * cls.PRIVATE_SURCHARGE), else_=base_price)
 
 
 class TourImage(Base):
     __tablename__ = "tour_images"
     id = Column(Integer, primary_key=True, index=True)
-    tour_id = Column(Integer, ForeignKey("tours.id"))
+    tour_id = Column(Integer, ForeignKey("tours.id", ondelete="CASCADE"), index=True)
     image_url = Column(String(200))
     is_primary = Column(Boolean, default=False)
     
@@ -119,11 +146,28 @@ class TourImage(Base):
     tour = relationship("Tour", back_populates="images")
 
 
+# Card/thumbnail image of a tour as one correlated subquery, so lists don't
+# load whole image collections for images[0]. The primary image wins, else
+# the first uploaded. Deferred: undefer(Tour.primary_image_url) where needed.
+Tour.primary_image_url = column_property(
+    select(TourImage.image_url)
+    .where(TourImage.tour_id == Tour.id)
+    .order_by(TourImage.is_primary.desc(), TourImage.id)
+    .limit(1)
+    .correlate_except(TourImage)
+    .scalar_subquery(),
+    deferred=True,
+)
+
+
 class Booking(Base):
     __tablename__ = "bookings"
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     tour_id = Column(Integer, ForeignKey("tours.id"))
+    # Copy of tours.creator_id (see _copy_tour_creator) so operator queries
+    # filter bookings without joining tours
+    creator_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     adults = Column(Integer)
     kids = Column(Integer)
     tour_date = Column(DateTime)
@@ -140,8 +184,8 @@ class Booking(Base):
     special_requirements = Column(String(500), nullable=True)
     
     # Relationships
-    user = relationship("User", back_populates="bookings")
-    tour = relationship("Tour", back_populates="bookings")
+    user = relationship("User", back_populates="bookings", foreign_keys=[user_id])
+    tour = relationship("Tour", back_populates="bookings", lazy="selectin")
     
     messages = relationship(
         "Message",
@@ -149,6 +193,17 @@ class Booking(Base):
         cascade="all, delete-orphan"
     )
 
+    __table_args__ = (
+        # revenue stats: status = 'confirmed' AND created_at in a date range
+        Index("ix_bookings_status_created", "status", "created_at"),
+        # recent bookings: ORDER BY created_at DESC LIMIT n, read backwards
+        Index("ix_bookings_created", "created_at"),
+        # an operator's recent bookings: per tour, newest first
+        Index("ix_bookings_tour_created", "tour_id", "created_at"),
+        # operator dashboard lists and totals, no join to tours
+        Index("ix_bookings_creator_created", "creator_id", "created_at"),
+    )
+
     @property
     def participant_count(self):
         return self.adults + self.kids
@@ -204,6 +259,8 @@ class Review(Base):
     id = Column(Integer, primary_key=True, index=True)
     tour_id = Column(Integer, ForeignKey("tours.id"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    # Copy of tours.creator_id, like Booking.creator_id
+    creator_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     rating = Column(Integer, nullable=False)  # 1-5
     comment = Column(Text, nullable=True)
     is_verified = Column(Boolean, default=False)
@@ -211,17 +268,44 @@ class Review(Base):
     
     # Relationships
     tour = relationship("Tour", back_populates="reviews")
-    user = relationship("User", back_populates="reviews")
-    
-    
-    
-# Add this MessageStatus enum
+    user = relationship("User", back_populates="reviews", foreign_keys=[user_id])
+
+    __table_args__ = (
+        # same access paths as bookings: newest overall / newest per tour /
+        # an operator's newest
+        Index("ix_reviews_created", "created_at"),
+        Index("ix_reviews_tour_created", "tour_id", "created_at"),
+        Index("ix_reviews_creator_created", "creator_id", "created_at"),
+    )
+
+
+@event.listens_for(Booking, "before_insert")
+@event.listens_for(Review, "before_insert")
+def _copy_tour_creator(mapper, connection, target):
+    """Fill creator_id from the booked/reviewed tour on insert."""
+    if target.tour_id is not None:
+        target.creator_id = connection.scalar(select(Tour.creator_id).where(Tour.id == target.tour_id))
+
+
+@event.listens_for(Tour, "after_update")
+def _propagate_tour_creator(mapper, connection, target):
+    """Keep the copies in step if a tour changes hands."""
+    if not get_history(target, "creator_id").has_changes():
+        return
+    for model in (Booking, Review):
+        connection.execute(
+            update(model.__table__)
+            .where(model.__table__.c.tour_id == target.id)
+            .values(creator_id=target.creator_id)
+        )
+
+
 class MessageStatus(enum.Enum):
     UNREAD = "unread"
     READ = "read"
     ARCHIVED = "archived"
 
-# Add this Message model
+
 class Message(Base):
     __tablename__ = "messages"
     
@@ -229,30 +313,52 @@ class Message(Base):
     sender_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     receiver_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     booking_id = Column(Integer, ForeignKey("bookings.id"), nullable=True)  # Optional: link to specific booking
-    parent_message_id = Column(Integer, ForeignKey("messages.id"), nullable=True)  # For threading
+    parent_message_id = Column(Integer, ForeignKey("messages.id", ondelete="SET NULL"), nullable=True)  # For threading
     subject = Column(String(255), nullable=True)
     content = Column(Text, nullable=False)
-    status = Column(Enum(MessageStatus), default=MessageStatus.UNREAD)
+    # Native ENUM on Postgres (and MySQL) under an explicit type name
+    status = Column(Enum(MessageStatus, name="message_status"), nullable=False, default=MessageStatus.UNREAD)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
-    sender = relationship("User", foreign_keys=[sender_id], back_populates="sent_messages")
-    receiver = relationship("User", foreign_keys=[receiver_id], back_populates="received_messages")
+    sender = relationship("User", foreign_keys=[sender_id], back_populates="sent_messages", lazy="selectin")
+    receiver = relationship("User", foreign_keys=[receiver_id], back_populates="received_messages", lazy="selectin")
     booking = relationship("Booking", back_populates="messages")
     parent_message = relationship("Message", remote_side=[id], back_populates="replies")
-    replies = relationship("Message", back_populates="parent_message")
+    replies = relationship("Message", back_populates="parent_message", passive_deletes=True)
     
+    __table_args__ = (
+        # inbox: receiver_id = ? AND status = ? ORDER BY created_at, served
+        # from the index alone; also covers mark_conversation_as_read
+        Index("ix_msg_inbox", "receiver_id", "status", "created_at"),
+        # get_user_messages: (sender OR receiver) ORDER BY created_at DESC
+        Index("ix_messages_sender_created", "sender_id", "created_at"),
+        Index("ix_messages_receiver_created", "receiver_id", "created_at"),
+        # append-only timestamp: BRIN stays tiny compared to a btree
+        Index("ix_messages_created_brin", "created_at", postgresql_using="brin"),
+        # inbox badge: only the (small) unread subset
+        Index(
+            "ix_messages_unread",
+            "receiver_id",
+            postgresql_where=text("status = 'UNREAD'"),
+            sqlite_where=text("status = 'UNREAD'"),
+        ),
+    )
+
     def mark_as_read(self):
         self.status = MessageStatus.READ
         return self
 
-# Update User model to include messages (add to existing User model)
-# In your existing User model, add:
-# sent_messages = relationship("Message", foreign_keys=[Message.sender_id], back_populates="sender")
-# received_messages = relationship("Message", foreign_keys=[Message.receiver_id], back_populates="receiver")
-
-# Update Booking model to include messages (add to existing Booking model)
-# In your existing Booking model, add:
-# messages = relationship("Message", back_populates="booking")    
 
+@event.listens_for(Message, "before_delete")
+def _release_unread(mapper, connection, target):
+    """Drop an unread message from its receiver's badge count when the ORM
+    deletes it, e.g. through the Tour -> Booking -> Message or User
+    cascades. MessageCRUD's bulk DELETEs adjust the counter themselves."""
+    if target.status == MessageStatus.UNREAD:
+        connection.execute(
+            update(User.__table__)
+            .where(User.__table__.c.id == target.receiver_id)
+            .values(unread_count=User.__table__.c.unread_count - 1)
+        )
@@ -1,33 +1,129 @@
-import uuid
+import asyncio
+import contextlib
+import hashlib
+import heapq
+import itertools
 import os
+import shutil
 import json
-from fastapi import APIRouter, Request, Depends, HTTPException, Form, File, UploadFile, BackgroundTasks
-from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, desc, extract
+from dataclasses import dataclass
+import orjson
+from fastapi import APIRouter, Request, Response, Depends, HTTPException, Form, File, UploadFile, BackgroundTasks
+from fastapi.responses import HTMLResponse, RedirectResponse, ORJSONResponse, StreamingResponse
+from sqlalchemy.orm import Session, joinedload, selectinload, lazyload
+from sqlalchemy import func, insert, select, update, delete, and_, case, lambda_stmt
 from typing import List, Optional
 from datetime import datetime, timedelta
-from passlib.context import CryptContext
 
 from app.models import User, Tour, TourImage, Booking, Review
-from app.utils import get_current_admin, notify_subscribers
-from app.database import get_db
-from fastapi.templating import Jinja2Templates
+from app.utils import get_current_admin, save_upload, is_image_upload, hash_password_async, verify_password_async
+from app.database import SessionLocal, get_db
+from app.cache import tour_cache, stats_cache, page_cache, dashboard_tours_key, dashboard_page_key, tour_key, stats_key, invalidate_tour, invalidate_stats
+from app.images import transcode_tour_images
+from app.analytics import dashboard_totals, revenue_series, top_tours
+from app.tasks import enqueue_notify_subscribers
+from app.templating import templates
 
-router = APIRouter()
-templates = Jinja2Templates(directory="app/templates", auto_reload=True)
+# orjson serializes datetimes natively, so JSON endpoints return them as is.
+# The larger JSON endpoints return an ORJSONResponse themselves and declare
+# response_model=None: a response model (or a return annotation FastAPI
+# infers one from) would bring back Pydantic validation and jsonable_encoder.
+router = APIRouter(default_response_class=ORJSONResponse)
 
-# Password context for hashing and verification
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Created once at import; per-tour directories are created as tours get images
+PROFILE_PICTURE_DIR = "static/uploads/profile_pictures"
+os.makedirs(PROFILE_PICTURE_DIR, exist_ok=True)
 
-# Helper functions for password handling
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+def _dashboard_tour_cards(db: Session, creator_id: Optional[int] = None) -> List[dict]:
+    """Tour cards for the dashboard, built from one column query.
+
+    Only the fields the cards show are fetched (the description already cut
+    to its 50-char preview, and just the thumbnail rather than every image
+    row), so the long text columns never leave the database and no ORM
+    objects are built."""
+    query = select(
+        Tour.id,
+        Tour.title,
+        func.substr(Tour.description, 1, 50).label('description'),
+        Tour.tour_type,
+        Tour.price,
+        Tour.country,
+        Tour.duration,
+        Tour.primary_image_url,
+    )
+    if creator_id is not None:
+        query = query.where(Tour.creator_id == creator_id)
+    return [
+        {
+            'id': row.id,
+            'title': row.title,
+            'description': row.description,
+            'tour_type': row.tour_type,
+            'price': row.price,
+            'country': row.country,
+            'duration': row.duration,
+            'images': [{'image_url': row.primary_image_url}] if row.primary_image_url else [],
+        }
+        for row in db.execute(query)
+    ]
+
+# The list queries below run on every dashboard load. They are built with
+# lambda_stmt, so the statement is constructed and its cache key computed
+# once per call site; later calls only bind creator_id.
+
+def _recent_bookings(db: Session, creator_id: Optional[int] = None):
+    """The 10 newest bookings with the tour and customer fields the
+    dashboard shows."""
+    query = lambda_stmt(lambda: select(Booking).options(
+        joinedload(Booking.tour).load_only(Tour.title, Tour.primary_image_url),
+        joinedload(Booking.user).load_only(User.full_name, User.email)
+    ).order_by(Booking.created_at.desc()).limit(10))
+    if creator_id is not None:
+        query += lambda s: s.where(Booking.creator_id == creator_id)
+    return db.scalars(query).all()
+
+def _recent_reviews(db: Session, creator_id: Optional[int] = None):
+    """The 10 newest reviews with tour title and reviewer name."""
+    query = lambda_stmt(lambda: select(Review).options(
+        joinedload(Review.tour).load_only(Tour.title),
+        joinedload(Review.user).load_only(User.full_name)
+    ).order_by(Review.created_at.desc()).limit(10))
+    if creator_id is not None:
+        query += lambda s: s.where(Review.creator_id == creator_id)
+    return db.scalars(query).all()
+
+def _tour_upload_dir(tour_id: int) -> str:
+    # One directory per tour, so deleting a tour removes its files in one go
+    return f"static/uploads/{tour_id}"
+
+def _unlink_quietly(path: str) -> None:
+    """Remove a file, ignoring it if it's already gone (no stat first)."""
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(path)
+
+async def _unlink_many(paths: List[str]) -> None:
+    """Remove files concurrently, one worker thread per unlink."""
+    await asyncio.gather(*(asyncio.to_thread(_unlink_quietly, path) for path in paths))
+
+async def _optimize_tour_images(tour_id: int, creator_id: Optional[int], image_urls: List[str]) -> None:
+    """Background step after an upload: swap the stored images for resized
+    WebP copies, then drop the originals once nothing points at them."""
+    converted = await transcode_tour_images(image_urls)
+    if converted:
+        invalidate_tour(tour_id, creator_id)
+        await _unlink_many([url.lstrip("/") for url in converted])
+
+
+def _dashboard_variant(request: Request, user: User) -> str:
+    """Digest of what the dashboard shows besides the operator's data: the
+    user's profile fields and the session's flash messages."""
+    shown = (
+        user.full_name, user.email, user.phone, user.company_name, user.bio, user.picture,
+        user.is_admin, user.is_superadmin,
+        request.session.get('success'), request.session.get('error'),
+    )
+    return hashlib.blake2b(repr(shown).encode(), digest_size=8).hexdigest()
 
-def hash_password(password: str) -> str:
-    """Hash a password"""
-    return pwd_context.hash(password)
 
 @router.get('/admin/dashboard', response_class=HTMLResponse)
 async def admin_dashboard(
@@ -36,138 +132,51 @@ async def admin_dashboard(
     user: User = Depends(get_current_admin)
 ):
     """Admin dashboard with statistics and data visualization"""
+    # With Redis the rendered page is cached briefly per user, so repeated
+    # refreshes skip both the queries and the render. Tour, booking and
+    # review changes retire it through the operator's generation token (see
+    # app.cache).
+    creator_id = None if user.is_superadmin else user.id
+    page = page_cache.get_or_create(
+        dashboard_page_key(user.id, creator_id, _dashboard_variant(request, user)),
+        lambda: _render_dashboard(request, db, user, creator_id),
+    )
+    return HTMLResponse(page)
+
+
+def _render_dashboard(request: Request, db: Session, user: User, creator_id: Optional[int]) -> str:
+    # Get tours (admins see their own, superadmins see all). Cached as plain
+    # dicts, so they outlive the request session and survive pickling.
+    tours = tour_cache.get_or_create(
+        dashboard_tours_key(creator_id),
+        lambda: _dashboard_tour_cards(db, creator_id=creator_id),
+    )
+
+    # Booking and review figures (from mv_admin_tour_stats on Postgres)
+    totals = dashboard_totals(db, creator_id)
+    total_bookings = totals.bookings
+    total_revenue = totals.revenue
+    pending_bookings = totals.pending
+    total_reviews = totals.reviews
+
+    # Last 10 bookings and reviews (an operator's own, or all for superadmins)
+    recent_bookings = _recent_bookings(db, creator_id)
+    reviews = _recent_reviews(db, creator_id)
     
-    # Get tours (admins see their own, superadmins see all)
-    if user.is_superadmin:
-        tours = db.query(Tour).options(joinedload(Tour.images)).all()
-        # For superadmins, show all bookings
-        total_bookings = db.query(Booking).count()
-        
-        # Get total revenue from confirmed bookings
-        total_revenue = db.query(func.sum(Booking.total_price)).filter(
-            Booking.status == 'confirmed'
-        ).scalar() or 0
-        
-        # Get total reviews
-        total_reviews = db.query(Review).count()
-        
-        # Get recent bookings (last 10)
-        recent_bookings = db.query(Booking).options(
-            joinedload(Booking.tour),
-            joinedload(Booking.user)
-        ).order_by(Booking.created_at.desc()).limit(10).all()
-        
-        # Get reviews
-        reviews = db.query(Review).options(
-            joinedload(Review.tour),
-            joinedload(Review.user)
-        ).order_by(Review.created_at.desc()).limit(10).all()
-        
-        # Get pending bookings count
-        pending_bookings = db.query(Booking).filter(
-            Booking.status == 'pending'
-        ).count()
-        
-        # Get recent activities (simplified version)
-        recent_activities = []
-        
-    else:
-        # Regular admin - only see their own tours
-        tours = db.query(Tour).options(joinedload(Tour.images)).filter(Tour.creator_id == user.id).all()
-        
-        # Get bookings for this operator's tours
-        total_bookings = db.query(Booking).join(Tour).filter(Tour.creator_id == user.id).count()
-        
-        # Calculate total revenue
-        total_revenue = db.query(func.sum(Booking.total_price)).join(Tour).filter(
-            Tour.creator_id == user.id,
-            Booking.status == 'confirmed'
-        ).scalar() or 0
-        
-        # Get reviews for this operator's tours
-        total_reviews = db.query(Review).join(Tour).filter(Tour.creator_id == user.id).count()
-        
-        # Get recent bookings for this operator
-        recent_bookings = db.query(Booking).join(Tour).filter(
-            Tour.creator_id == user.id
-        ).options(
-            joinedload(Booking.tour),
-            joinedload(Booking.user)
-        ).order_by(Booking.created_at.desc()).limit(10).all()
-        
-        # Get reviews for this operator
-        reviews = db.query(Review).join(Tour).filter(
-            Tour.creator_id == user.id
-        ).options(
-            joinedload(Review.tour),
-            joinedload(Review.user)
-        ).order_by(Review.created_at.desc()).limit(10).all()
-        
-        # Get pending bookings count
-        pending_bookings = db.query(Booking).join(Tour).filter(
-            Tour.creator_id == user.id,
-            Booking.status == 'pending'
-        ).count()
-        
-        # Get recent activities (simplified version)
-        recent_activities = []
+    # Get recent activities (simplified version)
+    recent_activities = []
     
     # Calculate statistics
     total_tours = len(tours)
     
-    # Get top tours by revenue (simplified)
-    top_tours_data = []
-    if user.is_superadmin:
-        tour_revenues = db.query(
-            Tour,
-            func.sum(Booking.total_price).label('revenue')
-        ).outerjoin(Booking).filter(
-            Booking.status == 'confirmed'
-        ).group_by(Tour.id).order_by(desc('revenue')).limit(5).all()
-        
-        for tour, revenue in tour_revenues:
-            top_tours_data.append({
-                'title': tour.title,
-                'revenue': revenue or 0,
-                'image': tour.images[0].image_url if tour.images else None
-            })
-    else:
-        tour_revenues = db.query(
-            Tour,
-            func.sum(Booking.total_price).label('revenue')
-        ).outerjoin(Booking).filter(
-            Tour.creator_id == user.id,
-            Booking.status == 'confirmed'
-        ).group_by(Tour.id).order_by(desc('revenue')).limit(5).all()
-        
-        for tour, revenue in tour_revenues:
-            top_tours_data.append({
-                'title': tour.title,
-                'revenue': revenue or 0,
-                'image': tour.images[0].image_url if tour.images else None
-            })
+    # Top tours by confirmed revenue
+    top_tours_data = top_tours(db, creator_id)
     
-    # Calculate average rating
-    if user.is_superadmin:
-        avg_rating = db.query(func.avg(Review.rating)).scalar() or 4.5
-    else:
-        avg_rating = db.query(func.avg(Review.rating)).join(Tour).filter(
-            Tour.creator_id == user.id
-        ).scalar() or 4.5
+    # Average rating and rating distribution
+    avg_rating = totals.average or 4.5
+    rating_distribution = {i: totals._mapping[f'rating_{i}'] for i in range(1, 6)}
     
-    # Calculate rating distribution
-    rating_distribution = {}
-    for i in range(1, 6):
-        if user.is_superadmin:
-            count = db.query(Review).filter(Review.rating == i).count()
-        else:
-            count = db.query(Review).join(Tour).filter(
-                Tour.creator_id == user.id,
-                Review.rating == i
-            ).count()
-        rating_distribution[i] = count
-    
-    return templates.TemplateResponse("admin/dashboard.html", {
+    return templates.get_template("admin/dashboard.html").render({
         "request": request,
         "user": user,
         "tours": tours,
@@ -182,6 +191,7 @@ async def admin_dashboard(
         "recent_activities": recent_activities,
         "average_rating": round(float(avg_rating), 1),
         "rating_distribution": rating_distribution,
+        "stats_as_of": totals.as_of,
     })
 
 @router.post('/admin/tours/create', response_class=HTMLResponse)
@@ -229,32 +239,37 @@ async def create_tour(
         db.flush()
 
         # Handle images if provided
+        saved = []
         if images:
-            upload_dir = "static/uploads"
-            os.makedirs(upload_dir, exist_ok=True)
+            upload_dir = _tour_upload_dir(new_tour.id)
+            await asyncio.to_thread(os.makedirs, upload_dir, exist_ok=True)
 
-            for idx, image in enumerate(images):
-                if not image.content_type.startswith('image/'):
-                    continue
+            # Non-images are dropped after a 12-byte sniff, before any write.
+            # Save the rest concurrently; gather keeps the upload order
+            valid = [image for image in images if await is_image_upload(image)]
+            saved = await asyncio.gather(*(save_upload(image, upload_dir) for image in valid))
 
-                file_ext = os.path.splitext(image.filename)[1]
-                filename = f"{uuid.uuid4()}{file_ext}"
-                file_path = os.path.join(upload_dir, filename)
-
-                contents = await image.read()
-                with open(file_path, "wb") as f:
-                    f.write(contents)
-
-                db.add(TourImage(
-                    tour_id=new_tour.id,
-                    image_url=f"/static/uploads/{filename}",
-                    is_primary=(idx == 0)
-                ))
+            # One batched INSERT for all images instead of one per image
+            if saved:
+                db.execute(insert(TourImage), [
+                    {
+                        "tour_id": new_tour.id,
+                        "image_url": f"/{upload_dir}/{filename}",
+                        "is_primary": idx == 0,
+                    }
+                    for idx, filename in enumerate(saved)
+                ])
 
         db.commit()
+        invalidate_tour(new_tour.id, user.id)
+        invalidate_stats(user.id)
+        if saved:
+            background_tasks.add_task(
+                _optimize_tour_images, new_tour.id, user.id, [f"/{upload_dir}/{filename}" for filename in saved]
+            )
         
         if user.is_superadmin:
-            background_tasks.add_task(notify_subscribers, db, new_tour.id)
+            await enqueue_notify_subscribers(request.app.state.task_queue, background_tasks, new_tour.id)
         
         # Set success message in session
         request.session['success'] = "Tour created successfully"
@@ -265,26 +280,14 @@ async def create_tour(
         request.session['error'] = f"Error creating tour: {str(e)}"
         return RedirectResponse(url="/admin/dashboard", status_code=303)
 
-@router.get('/admin/tours/get/{tour_id}')
-async def get_tour(
-    tour_id: int,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_admin)
-):
-    """Get tour data for editing"""
-    try:
-        tour = db.query(Tour).options(joinedload(Tour.images)).filter(Tour.id == tour_id).first()
-        
-        if not tour:
-            raise HTTPException(status_code=404, detail="Tour not found")
-        
-        if not user.is_superadmin and tour.creator_id != user.id:
-            raise HTTPException(status_code=403, detail="Not authorized")
-        
-        # Parse duration
-        duration_parts = tour.duration.split(' ') if tour.duration else ['6', 'days']
-        
-        return {
+def _tour_edit_data(db: Session, tour_id: int) -> Optional[dict]:
+    """Owner and edit-form payload of one tour, or None if it doesn't exist."""
+    tour = db.get(Tour, tour_id, options=[selectinload(Tour.images)])
+    if not tour:
+        return None
+    return {
+        'creator_id': tour.creator_id,
+        'tour': {
             'id': tour.id,
             'title': tour.title,
             'description': tour.description,
@@ -300,7 +303,31 @@ async def get_tour(
             'cancellation_policy': tour.cancellation_policy,
             'is_active': tour.is_active,
             'images': [{'id': img.id, 'image_url': img.image_url} for img in tour.images]
-        }
+        },
+    }
+
+@router.get('/admin/tours/get/{tour_id}')
+async def get_tour(
+    tour_id: int,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_admin)
+):
+    """Get tour data for editing"""
+    try:
+        # Misses aren't cached, so a tour shows up as soon as it's created
+        cached = tour_cache.get_or_create(
+            tour_key(tour_id),
+            lambda: _tour_edit_data(db, tour_id),
+            should_cache_fn=lambda value: value is not None,
+        )
+        
+        if not cached:
+            raise HTTPException(status_code=404, detail="Tour not found")
+        
+        if not user.is_superadmin and cached['creator_id'] != user.id:
+            raise HTTPException(status_code=403, detail="Not authorized")
+        
+        return cached['tour']
     
     except HTTPException:
         raise
@@ -333,84 +360,92 @@ async def update_tour(
 ):
     
     try:
-        tour = db.query(Tour).options(joinedload(Tour.images)).filter(Tour.id == tour_id).first()
-        
-        if not tour:
-            raise HTTPException(status_code=404, detail="Tour not found")
-        
-        if not user.is_superadmin and tour.creator_id != user.id:
+        # The ownership check is part of the UPDATE itself, so the tour never
+        # has to be loaded
+        changed = {
+            'title': title,
+            'description': description,
+            'price': price,
+            'duration': f"{duration_value} {duration_unit}",
+            'locations': locations,  # Contains location information
+            'difficulty': difficulty,
+            'country': country,
+            'tour_type': tour_type,  # Contains category information
+            'max_participants': max_participants,
+            'cancellation_policy': cancellation_policy,
+            'is_active': is_active,
+        }
+        # An emptied textarea arrives as None and clears the field (the
+        # columns are NOT NULL, so it is stored as ""); only a field missing
+        # from the form entirely is left untouched. FastAPI has already
+        # parsed the form, so this reads the cached copy.
+        submitted = await request.form()
+        for field, value in (('included', included), ('not_included', not_included)):
+            if field in submitted:
+                changed[field] = value or ""
+        
+        allowed = Tour.id == tour_id
+        if not user.is_superadmin:
+            allowed = and_(allowed, Tour.creator_id == user.id)
+        
+        if not db.execute(update(Tour).where(allowed).values(**changed)).rowcount:
+            if db.get(Tour, tour_id) is None:
+                raise HTTPException(status_code=404, detail="Tour not found")
             raise HTTPException(status_code=403, detail="Not authorized")
-        
-        # Update tour fields
-        tour.title = title
-        tour.description = description
-        tour.price = price
-        tour.duration = f"{duration_value} {duration_unit}"
-        tour.locations = locations  # Contains location information
-        tour.difficulty = difficulty
-        tour.country = country
-        tour.tour_type = tour_type  # Contains category information
-        tour.max_participants = max_participants
-        tour.included = included
-        tour.not_included = not_included
-        tour.cancellation_policy = cancellation_policy
-        tour.is_active = is_active
-        tour.updated_at = datetime.utcnow()
+        # Needed to invalidate the owner's cached dashboard
+        creator_id = user.id if not user.is_superadmin else db.scalar(
+            select(Tour.creator_id).where(Tour.id == tour_id)
+        )
         
         # Handle existing images - remove those not in existing_images list
+        removed_paths = []
         if existing_images:
             existing_image_ids = [int(img_id) for img_id in existing_images if img_id]
-            images_to_remove = db.query(TourImage).filter(
-                TourImage.tour_id == tour.id,
-                TourImage.id.notin_(existing_image_ids)
-            ).all()
-            
-            for img in images_to_remove:
-                # Delete file from disk
-                filename = img.image_url.split("/")[-1]
-                image_path = os.path.join("static", "uploads", filename)
-                if os.path.exists(image_path):
-                    try:
-                        os.remove(image_path)
-                    except:
-                        pass
-                db.delete(img)
+            to_remove = (TourImage.tour_id == tour_id, TourImage.id.notin_(existing_image_ids))
+            removed_paths = [
+                image_url.lstrip("/")
+                for image_url in db.scalars(select(TourImage.image_url).where(*to_remove))
+            ]
+            db.execute(delete(TourImage).where(*to_remove))
         
         # Add new images
+        saved = []
         if images:
-            upload_dir = "static/uploads"
-            os.makedirs(upload_dir, exist_ok=True)
+            upload_dir = _tour_upload_dir(tour_id)
+            await asyncio.to_thread(os.makedirs, upload_dir, exist_ok=True)
+            
+            valid = [image for image in images if await is_image_upload(image)]
+            saved = await asyncio.gather(*(save_upload(image, upload_dir) for image in valid))
             
-            for image in images:
-                if not image.content_type.startswith('image/'):
-                    continue
-                
-                file_ext = os.path.splitext(image.filename)[1]
-                filename = f"{uuid.uuid4()}{file_ext}"
-                file_path = os.path.join(upload_dir, filename)
-                
-                contents = await image.read()
-                with open(file_path, "wb") as f:
-                    f.write(contents)
-                
-                # Check if we have any primary images left
-                has_primary = db.query(TourImage).filter(
-                    TourImage.tour_id == tour.id,
-                    TourImage.is_primary == True
-                ).count() > 0
-                
-                db.add(TourImage(
-                    tour_id=tour.id,
-                    image_url=f"/static/uploads/{filename}",
-                    is_primary=not has_primary  # Set as primary if no primary exists
-                ))
+            if saved:
+                # The first new image becomes primary if none is left
+                has_primary = db.scalar(
+                    select(TourImage.id).where(TourImage.tour_id == tour_id, TourImage.is_primary == True).limit(1)
+                ) is not None
+                db.execute(insert(TourImage), [
+                    {
+                        "tour_id": tour_id,
+                        "image_url": f"/{upload_dir}/{filename}",
+                        "is_primary": idx == 0 and not has_primary,
+                    }
+                    for idx, filename in enumerate(saved)
+                ])
         
         db.commit()
+        invalidate_tour(tour_id, creator_id)
+        invalidate_stats(creator_id)
+        background_tasks.add_task(_unlink_many, removed_paths)
+        if saved:
+            background_tasks.add_task(
+                _optimize_tour_images, tour_id, creator_id, [f"/{upload_dir}/{filename}" for filename in saved]
+            )
         
         # Set success message
         request.session['success'] = "Tour updated successfully"
         return RedirectResponse(url="/admin/dashboard", status_code=303)
         
+    except HTTPException:
+        raise
     except Exception as e:
         db.rollback()
         request.session['error'] = f"Error updating tour: {str(e)}"
@@ -420,11 +455,12 @@ async def update_tour(
 async def delete_tour(
     request: Request,
     tour_id: int,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_admin)
 ):
     try:
-        tour = db.query(Tour).options(joinedload(Tour.images)).filter(Tour.id == tour_id).first()
+        tour = db.get(Tour, tour_id)
         if not tour:
             request.session['error'] = "Tour not found"
             return RedirectResponse(url="/admin/dashboard", status_code=303)
@@ -433,18 +469,27 @@ async def delete_tour(
             request.session['error'] = "You can only delete tours you created"
             return RedirectResponse(url="/admin/dashboard", status_code=303)
         
-        # Delete associated images from disk
-        for img in tour.images:
-            filename = img.image_url.split("/")[-1]
-            image_path = os.path.join("static", "uploads", filename)
-            if os.path.exists(image_path):
-                try:
-                    os.remove(image_path)
-                except Exception as e:
-                    print(f"Error deleting file {image_path}: {str(e)}")
-        
+        # Tours created before per-tour directories keep their files
+        # directly under static/uploads
+        upload_dir = _tour_upload_dir(tour_id)
+        creator_id = tour.creator_id
+        legacy_paths = [
+            image_url.lstrip("/")
+            for image_url in db.scalars(select(TourImage.image_url).where(TourImage.tour_id == tour_id))
+            if not image_url.startswith(f"/{upload_dir}/")
+        ]
+        
+        # tour_images rows go with the tour through ON DELETE CASCADE; the
+        # images were never loaded, so the ORM leaves them to the database
         db.delete(tour)
         db.commit()
+        invalidate_tour(tour_id, creator_id)
+        invalidate_stats(creator_id)
+        
+        # Files go after the response is sent, and only once the rows are gone
+        background_tasks.add_task(shutil.rmtree, upload_dir, ignore_errors=True)
+        if legacy_paths:
+            background_tasks.add_task(_unlink_many, legacy_paths)
         
         request.session['success'] = "Tour deleted successfully"
         return RedirectResponse(url="/admin/dashboard", status_code=303)
@@ -469,13 +514,14 @@ async def update_booking_status(
         if new_status not in ['pending', 'confirmed', 'declined', 'cancelled']:
             raise HTTPException(status_code=400, detail="Invalid status")
         
-        booking = db.query(Booking).filter(Booking.id == booking_id).first()
+        # The booking carries its tour's owner; no need to load the tour
+        booking = db.scalar(select(Booking).where(Booking.id == booking_id).options(lazyload(Booking.tour)))
         if not booking:
             raise HTTPException(status_code=404, detail="Booking not found")
+        creator_id = booking.creator_id
         
         # Check if user has permission
-        tour = db.query(Tour).filter(Tour.id == booking.tour_id).first()
-        if not user.is_superadmin and tour.creator_id != user.id:
+        if not user.is_superadmin and creator_id != user.id:
             raise HTTPException(status_code=403, detail="Not authorized")
         
         # Update status and timestamps
@@ -488,6 +534,7 @@ async def update_booking_status(
         booking.updated_at = datetime.utcnow()
         
         db.commit()
+        invalidate_stats(creator_id)
         
         return {"success": True, "message": f"Booking status updated to {new_status}"}
     
@@ -515,19 +562,17 @@ async def bulk_update_booking_status(
             raise HTTPException(status_code=400, detail="No bookings selected")
         
         # Get bookings
-        if user.is_superadmin:
-            bookings = db.query(Booking).filter(Booking.id.in_(booking_ids)).all()
-        else:
-            bookings = db.query(Booking).join(Tour).filter(
-                Booking.id.in_(booking_ids),
-                Tour.creator_id == user.id
-            ).all()
+        query = select(Booking).where(Booking.id.in_(booking_ids)).options(lazyload(Booking.tour))
+        if not user.is_superadmin:
+            query = query.where(Booking.creator_id == user.id)
+        bookings = db.scalars(query).all()
         
         if not bookings:
             raise HTTPException(status_code=404, detail="No valid bookings found")
         
         # Update each booking
         now = datetime.utcnow()
+        creator_ids = {booking.creator_id for booking in bookings}
         for booking in bookings:
             booking.status = new_status
             booking.updated_at = now
@@ -537,6 +582,7 @@ async def bulk_update_booking_status(
                 booking.confirmed_at = now
         
         db.commit()
+        invalidate_stats(*creator_ids)
         
         return {
             "success": True, 
@@ -564,7 +610,9 @@ async def update_profile(
         
         if email := form.get('email'):
             # Check if email is already taken by another user
-            existing_user = db.query(User).filter(User.email == email, User.id != user.id).first()
+            existing_user = db.scalars(
+                select(User).where(User.email == email, User.id != user.id).limit(1)
+            ).first()
             if existing_user:
                 # Store error in session for display
                 request.session['error'] = "Email already in use"
@@ -599,38 +647,24 @@ async def upload_profile_picture(
 ):
     """Upload and update profile picture"""
     try:
-        if not picture.content_type.startswith('image/'):
-            return JSONResponse(
+        if not await is_image_upload(picture):
+            return ORJSONResponse(
                 status_code=400,
                 content={"success": False, "error": "File must be an image"}
             )
         
-        # Create upload directory
-        upload_dir = "static/uploads/profile_pictures"
-        os.makedirs(upload_dir, exist_ok=True)
-        
-        # Generate unique filename
-        file_ext = os.path.splitext(picture.filename)[1]
-        filename = f"{uuid.uuid4()}{file_ext}"
-        file_path = os.path.join(upload_dir, filename)
-        
-        # Save file
-        contents = await picture.read()
-        with open(file_path, "wb") as f:
-            f.write(contents)
+        # Save file under a unique name
+        filename = await save_upload(picture, PROFILE_PICTURE_DIR)
         
         # Delete old profile picture if exists
         if user.picture:
             old_filename = user.picture.split("/")[-1]
-            old_path = os.path.join(upload_dir, old_filename)
-            if os.path.exists(old_path):
-                try:
-                    os.remove(old_path)
-                except:
-                    pass
+            # A leftover file must not fail the upload
+            with contextlib.suppress(OSError):
+                await asyncio.to_thread(os.unlink, os.path.join(PROFILE_PICTURE_DIR, old_filename))
         
         # Update user record
-        user.picture = f"/static/uploads/profile_pictures/{filename}"
+        user.picture = f"/{PROFILE_PICTURE_DIR}/{filename}"
         db.commit()
         
         return {
@@ -640,7 +674,7 @@ async def upload_profile_picture(
         }
     
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"success": False, "error": str(e)}
         )
@@ -665,7 +699,7 @@ async def change_password(
             return RedirectResponse(url="/admin/dashboard#profile", status_code=303)
         
         # Verify current password
-        if not verify_password(current_password, user.hashed_password):
+        if not await verify_password_async(current_password, user.hashed_password):
             request.session['error'] = "Current password is incorrect"
             return RedirectResponse(url="/admin/dashboard#profile", status_code=303)
         
@@ -679,7 +713,7 @@ async def change_password(
             return RedirectResponse(url="/admin/dashboard#profile", status_code=303)
         
         # Update password
-        user.hashed_password = hash_password(new_password)
+        user.hashed_password = await hash_password_async(new_password)
         db.commit()
         
         # Set success message
@@ -698,18 +732,19 @@ async def verify_review(
 ):
     """Verify a review"""
     try:
-        review = db.query(Review).filter(Review.id == review_id).first()
+        review = db.get(Review, review_id)
         if not review:
             raise HTTPException(status_code=404, detail="Review not found")
+        creator_id = review.creator_id
         
         # Check permission
-        tour = db.query(Tour).filter(Tour.id == review.tour_id).first()
-        if not user.is_superadmin and tour.creator_id != user.id:
+        if not user.is_superadmin and creator_id != user.id:
             raise HTTPException(status_code=403, detail="Not authorized")
         
         review.is_verified = True
         review.verified_at = datetime.utcnow()
         db.commit()
+        invalidate_stats(creator_id)
         
         return {"success": True, "message": "Review verified successfully"}
     
@@ -726,17 +761,18 @@ async def delete_review(
 ):
     """Delete a review"""
     try:
-        review = db.query(Review).filter(Review.id == review_id).first()
+        review = db.get(Review, review_id)
         if not review:
             raise HTTPException(status_code=404, detail="Review not found")
+        creator_id = review.creator_id
         
         # Check permission
-        tour = db.query(Tour).filter(Tour.id == review.tour_id).first()
-        if not user.is_superadmin and tour.creator_id != user.id:
+        if not user.is_superadmin and creator_id != user.id:
             raise HTTPException(status_code=403, detail="Not authorized")
         
         db.delete(review)
         db.commit()
+        invalidate_stats(creator_id)
         
         return {"success": True, "message": "Review deleted successfully"}
     
@@ -745,50 +781,61 @@ async def delete_review(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error deleting review: {str(e)}")
 
-@router.get('/admin/bookings')
+@router.get('/admin/bookings', response_model=None)
 async def get_all_bookings(
     db: Session = Depends(get_db),
     user: User = Depends(get_current_admin)
 ):
     """Get all bookings with filtering"""
     try:
-        if user.is_superadmin:
-            bookings = db.query(Booking).options(
-                joinedload(Booking.tour),
-                joinedload(Booking.user)
-            ).order_by(Booking.created_at.desc()).all()
-        else:
-            bookings = db.query(Booking).join(Tour).filter(
-                Tour.creator_id == user.id
-            ).options(
-                joinedload(Booking.tour),
-                joinedload(Booking.user)
-            ).order_by(Booking.created_at.desc()).all()
+        # Plain column rows: no ORM objects, identity map or eager loads
+        query = select(
+            Booking.id,
+            Booking.tour_date,
+            Booking.adults,
+            Booking.kids,
+            Booking.total_price,
+            Booking.status,
+            Booking.created_at,
+            Tour.id.label('tour_id'),
+            Tour.title.label('tour_title'),
+            Tour.primary_image_url,
+            User.id.label('user_id'),
+            User.full_name,
+            User.email,
+        ).select_from(Booking).outerjoin(Tour, Booking.tour_id == Tour.id).outerjoin(
+            User, Booking.user_id == User.id
+        )
+        if not user.is_superadmin:
+            query = query.where(Booking.creator_id == user.id)
+        rows = db.execute(query.order_by(Booking.created_at.desc()))
         
         # Convert to serializable format
-        bookings_data = []
-        for booking in bookings:
-            bookings_data.append({
-                'id': booking.id,
+        bookings_data = [
+            {
+                'id': row.id,
                 'tour': {
-                    'id': booking.tour.id if booking.tour else None,
-                    'title': booking.tour.title if booking.tour else None,
-                    'images': [img.image_url for img in booking.tour.images] if booking.tour and booking.tour.images else []
+                    'id': row.tour_id,
+                    'title': row.tour_title,
+                    'images': [row.primary_image_url] if row.primary_image_url else []
                 },
                 'user': {
-                    'id': booking.user.id if booking.user else None,
-                    'full_name': booking.user.full_name if booking.user else None,
-                    'email': booking.user.email if booking.user else None,
+                    'id': row.user_id,
+                    'full_name': row.full_name,
+                    'email': row.email,
                 },
-                'tour_date': booking.tour_date.isoformat() if booking.tour_date else None,
-                'adults': booking.adults,
-                'kids': booking.kids,
-                'total_price': booking.total_price,
-                'status': booking.status,
-                'created_at': booking.created_at.isoformat() if booking.created_at else None,
-            })
+                'tour_date': row.tour_date,
+                'adults': row.adults,
+                'kids': row.kids,
+                'total_price': row.total_price,
+                'status': row.status,
+                'created_at': row.created_at,
+            }
+            for row in rows
+        ]
         
-        return bookings_data
+        # Returned as a response so the list skips jsonable_encoder
+        return ORJSONResponse(bookings_data)
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching bookings: {str(e)}")
@@ -801,103 +848,82 @@ async def get_revenue_analytics(
 ):
     """Get revenue analytics data"""
     try:
-        current_date = datetime.utcnow()
-        
-        if period == "monthly":
-            # Get last 12 months
-            labels = []
-            data = []
-            
-            for i in range(11, -1, -1):
-                month_date = current_date - timedelta(days=30*i)
-                month_key = month_date.strftime("%b %Y")
-                labels.append(month_key)
-                
-                # Calculate revenue for this month
-                if user.is_superadmin:
-                    revenue = db.query(func.sum(Booking.total_price)).filter(
-                        Booking.status == 'confirmed',
-                        extract('year', Booking.created_at) == month_date.year,
-                        extract('month', Booking.created_at) == month_date.month
-                    ).scalar() or 0
-                else:
-                    revenue = db.query(func.sum(Booking.total_price)).join(Tour).filter(
-                        Tour.creator_id == user.id,
-                        Booking.status == 'confirmed',
-                        extract('year', Booking.created_at) == month_date.year,
-                        extract('month', Booking.created_at) == month_date.month
-                    ).scalar() or 0
-                
-                data.append(float(revenue))
-        
-        elif period == "quarterly":
-            # Get last 4 quarters
-            labels = []
-            data = []
-            
-            for i in range(3, -1, -1):
-                quarter_date = current_date - timedelta(days=90*i)
-                quarter_num = (quarter_date.month - 1) // 3 + 1
-                quarter_key = f"Q{quarter_num} {quarter_date.year}"
-                labels.append(quarter_key)
-                
-                # Calculate revenue for this quarter
-                start_month = (quarter_num - 1) * 3 + 1
-                end_month = start_month + 2
-                
-                if user.is_superadmin:
-                    revenue = db.query(func.sum(Booking.total_price)).filter(
-                        Booking.status == 'confirmed',
-                        extract('year', Booking.created_at) == quarter_date.year,
-                        extract('month', Booking.created_at) >= start_month,
-                        extract('month', Booking.created_at) <= end_month
-                    ).scalar() or 0
-                else:
-                    revenue = db.query(func.sum(Booking.total_price)).join(Tour).filter(
-                        Tour.creator_id == user.id,
-                        Booking.status == 'confirmed',
-                        extract('year', Booking.created_at) == quarter_date.year,
-                        extract('month', Booking.created_at) >= start_month,
-                        extract('month', Booking.created_at) <= end_month
-                    ).scalar() or 0
-                
-                data.append(float(revenue))
-        
-        else:  # yearly
-            # Get last 5 years
-            labels = []
-            data = []
-            
-            for i in range(4, -1, -1):
-                year = current_date.year - i
-                labels.append(str(year))
-                
-                if user.is_superadmin:
-                    revenue = db.query(func.sum(Booking.total_price)).filter(
-                        Booking.status == 'confirmed',
-                        extract('year', Booking.created_at) == year
-                    ).scalar() or 0
-                else:
-                    revenue = db.query(func.sum(Booking.total_price)).join(Tour).filter(
-                        Tour.creator_id == user.id,
-                        Booking.status == 'confirmed',
-                        extract('year', Booking.created_at) == year
-                    ).scalar() or 0
-                
-                data.append(float(revenue))
+        # One aggregate query (plus the materialized view on Postgres)
+        # instead of one query per month, quarter or year, cached briefly
+        creator_id = None if user.is_superadmin else user.id
+        series = period if period in ("monthly", "quarterly") else "yearly"
+        labels, data = stats_cache.get_or_create(
+            stats_key(creator_id, f"revenue|{series}"),
+            lambda: revenue_series(db, series, creator_id),
+        )
         
+        # Parallel lists, oldest bucket first: the chart uses them as is
         return {
             "period": period,
             "labels": labels,
             "data": data,
-            "last_12_months": dict(zip(labels, data)) if period == "monthly" else {},
-            "quarterly": dict(zip(labels, data)) if period == "quarterly" else {},
-            "yearly": dict(zip(labels, data)) if period == "yearly" else {}
         }
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error calculating revenue analytics: {str(e)}")
 
+def _stats_overview(db: Session, creator_id: Optional[int]) -> dict:
+    """Figures for /admin/stats/overview, for all tours or one operator's."""
+    # Get counts
+    tour_count = select(func.count(Tour.id))
+    if creator_id is not None:
+        tour_count = tour_count.where(Tour.creator_id == creator_id)
+    total_tours = db.scalar(tour_count)
+    totals = dashboard_totals(db, creator_id)
+    total_bookings = totals.bookings
+    pending_bookings = totals.pending
+    confirmed_bookings = totals.confirmed
+    total_revenue = totals.revenue
+    total_reviews = totals.reviews
+    
+    # Calculate month-over-month growth. Range predicates on created_at
+    # (not strftime) so ix_bookings_status_created serves both months
+    # in one aggregate
+    this_start = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    last_start = (this_start - timedelta(days=1)).replace(day=1)
+    in_this_month = Booking.created_at >= this_start
+    month_revenue = select(
+        func.coalesce(func.sum(case((in_this_month, Booking.total_price))), 0),
+        func.coalesce(func.sum(case((~in_this_month, Booking.total_price))), 0),
+    ).where(
+        Booking.status == 'confirmed',
+        Booking.created_at >= last_start
+    )
+    if creator_id is not None:
+        month_revenue = month_revenue.where(Booking.creator_id == creator_id)
+    current_month_revenue, last_month_revenue = db.execute(month_revenue).one()
+    
+    # Calculate growth percentage
+    revenue_growth = 0
+    if last_month_revenue > 0:
+        revenue_growth = ((current_month_revenue - last_month_revenue) / last_month_revenue * 100)
+    
+    # Calculate average booking value
+    average_booking_value = 0
+    if confirmed_bookings > 0:
+        average_booking_value = total_revenue / confirmed_bookings
+    
+    return {
+        "success": True,
+        "total_tours": total_tours,
+        "total_bookings": total_bookings,
+        "total_reviews": total_reviews,
+        "pending_bookings": pending_bookings,
+        "confirmed_bookings": confirmed_bookings,
+        "total_revenue": float(total_revenue),
+        "current_month_revenue": float(current_month_revenue),
+        "last_month_revenue": float(last_month_revenue),
+        "revenue_growth": round(revenue_growth, 2),
+        "average_booking_value": round(average_booking_value, 2),
+        # When the totals were computed (mv_admin_tour_stats); None when live
+        "as_of": totals.as_of,
+    }
+
 @router.get('/admin/stats/overview')
 async def get_stats_overview(
     db: Session = Depends(get_db),
@@ -905,84 +931,13 @@ async def get_stats_overview(
 ):
     """Get overview statistics for dashboard"""
     try:
-        # Get counts
-        if user.is_superadmin:
-            total_tours = db.query(Tour).count()
-            total_bookings = db.query(Booking).count()
-            total_reviews = db.query(Review).count()
-            pending_bookings = db.query(Booking).filter(Booking.status == 'pending').count()
-            confirmed_bookings = db.query(Booking).filter(Booking.status == 'confirmed').count()
-            total_revenue = db.query(func.sum(Booking.total_price)).filter(
-                Booking.status == 'confirmed'
-            ).scalar() or 0
-        else:
-            total_tours = db.query(Tour).filter(Tour.creator_id == user.id).count()
-            total_bookings = db.query(Booking).join(Tour).filter(Tour.creator_id == user.id).count()
-            total_reviews = db.query(Review).join(Tour).filter(Tour.creator_id == user.id).count()
-            pending_bookings = db.query(Booking).join(Tour).filter(
-                Tour.creator_id == user.id,
-                Booking.status == 'pending'
-            ).count()
-            confirmed_bookings = db.query(Booking).join(Tour).filter(
-                Tour.creator_id == user.id,
-                Booking.status == 'confirmed'
-            ).count()
-            total_revenue = db.query(func.sum(Booking.total_price)).join(Tour).filter(
-                Tour.creator_id == user.id,
-                Booking.status == 'confirmed'
-            ).scalar() or 0
-        
-        # Calculate month-over-month growth
-        current_month = datetime.utcnow().strftime("%Y-%m")
-        last_month_date = (datetime.utcnow().replace(day=1) - timedelta(days=1))
-        last_month = last_month_date.strftime("%Y-%m")
-        
-        if user.is_superadmin:
-            current_month_revenue = db.query(func.sum(Booking.total_price)).filter(
-                Booking.status == 'confirmed',
-                func.strftime("%Y-%m", Booking.created_at) == current_month
-            ).scalar() or 0
-            
-            last_month_revenue = db.query(func.sum(Booking.total_price)).filter(
-                Booking.status == 'confirmed',
-                func.strftime("%Y-%m", Booking.created_at) == last_month
-            ).scalar() or 0
-        else:
-            current_month_revenue = db.query(func.sum(Booking.total_price)).join(Tour).filter(
-                Tour.creator_id == user.id,
-                Booking.status == 'confirmed',
-                func.strftime("%Y-%m", Booking.created_at) == current_month
-            ).scalar() or 0
-            
-            last_month_revenue = db.query(func.sum(Booking.total_price)).join(Tour).filter(
-                Tour.creator_id == user.id,
-                Booking.status == 'confirmed',
-                func.strftime("%Y-%m", Booking.created_at) == last_month
-            ).scalar() or 0
-        
-        # Calculate growth percentage
-        revenue_growth = 0
-        if last_month_revenue > 0:
-            revenue_growth = ((current_month_revenue - last_month_revenue) / last_month_revenue * 100)
-        
-        # Calculate average booking value
-        average_booking_value = 0
-        if confirmed_bookings > 0:
-            average_booking_value = total_revenue / confirmed_bookings
-        
-        return {
-            "success": True,
-            "total_tours": total_tours,
-            "total_bookings": total_bookings,
-            "total_reviews": total_reviews,
-            "pending_bookings": pending_bookings,
-            "confirmed_bookings": confirmed_bookings,
-            "total_revenue": float(total_revenue),
-            "current_month_revenue": float(current_month_revenue),
-            "last_month_revenue": float(last_month_revenue),
-            "revenue_growth": round(revenue_growth, 2),
-            "average_booking_value": round(average_booking_value, 2)
-        }
+        # Cached briefly per operator (superadmins share one entry); booking,
+        # review and tour changes drop it
+        creator_id = None if user.is_superadmin else user.id
+        return stats_cache.get_or_create(
+            stats_key(creator_id, "overview"),
+            lambda: _stats_overview(db, creator_id),
+        )
     
     except Exception as e:
         return {
@@ -1000,143 +955,268 @@ async def get_stats_overview(
             "average_booking_value": 0
         }
 
-@router.get('/admin/recent/activities')
-async def get_recent_activities(
+# Plain def: the blocking queries run in FastAPI's threadpool instead of
+# stalling the event loop (the request's session scope travels with the
+# copied context)
+@router.get('/admin/recent/activities', response_model=None)
+def get_recent_activities(
     limit: int = 10,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_admin)
 ):
     """Get recent activities for dashboard"""
-    try:
-        activities = []
-        now = datetime.utcnow()
-        
-        # Helper function to format time
-        def format_time(dt):
-            diff = now - dt
-            if diff.days > 30:
-                return f"{diff.days // 30} months ago"
-            elif diff.days > 0:
-                return f"{diff.days} days ago"
-            elif diff.seconds > 3600:
-                return f"{diff.seconds // 3600} hours ago"
-            elif diff.seconds > 60:
-                return f"{diff.seconds // 60} minutes ago"
-            else:
-                return "Just now"
-        
-        # Get recent bookings
-        if user.is_superadmin:
-            recent_bookings = db.query(Booking).options(
-                joinedload(Booking.tour),
-                joinedload(Booking.user)
-            ).order_by(Booking.created_at.desc()).limit(limit).all()
+    now = datetime.utcnow()
+    
+    # Helper function to format time
+    def format_time(dt):
+        diff = now - dt
+        if diff.days > 30:
+            return f"{diff.days // 30} months ago"
+        elif diff.days > 0:
+            return f"{diff.days} days ago"
+        elif diff.seconds > 3600:
+            return f"{diff.seconds // 3600} hours ago"
+        elif diff.seconds > 60:
+            return f"{diff.seconds // 60} minutes ago"
         else:
-            recent_bookings = db.query(Booking).join(Tour).filter(
-                Tour.creator_id == user.id
+            return "Just now"
+    
+    # Get recent bookings
+    if user.is_superadmin:
+        recent_bookings = db.scalars(
+            select(Booking).options(
+                joinedload(Booking.tour).load_only(Tour.title),
+                joinedload(Booking.user).load_only(User.full_name)
+            ).order_by(Booking.created_at.desc()).limit(limit)
+        ).all()
+    else:
+        recent_bookings = db.scalars(
+            select(Booking).where(
+                Booking.creator_id == user.id
             ).options(
-                joinedload(Booking.tour),
-                joinedload(Booking.user)
-            ).order_by(Booking.created_at.desc()).limit(limit).all()
-        
-        for booking in recent_bookings:
-            activities.append({
-                'type': 'booking',
-                'title': f'New Booking #{booking.id}',
-                'description': f'{booking.user.full_name if booking.user else "Customer"} booked "{booking.tour.title[:30] if booking.tour else "Tour"}..."',
-                'time': format_time(booking.created_at),
-                'icon': 'calendar-check'
-            })
-        
-        # Get recent reviews
-        if user.is_superadmin:
-            recent_reviews = db.query(Review).options(
-                joinedload(Review.tour),
-                joinedload(Review.user)
-            ).order_by(Review.created_at.desc()).limit(limit).all()
-        else:
-            recent_reviews = db.query(Review).join(Tour).filter(
-                Tour.creator_id == user.id
+                joinedload(Booking.tour).load_only(Tour.title),
+                joinedload(Booking.user).load_only(User.full_name)
+            ).order_by(Booking.created_at.desc()).limit(limit)
+        ).all()
+    
+    # Each source comes back newest first from its created_at index
+    booking_activities = []
+    for booking in recent_bookings:
+        customer, tour = booking.user, booking.tour
+        booking_activities.append({
+            'type': 'booking',
+            'title': f'New Booking #{booking.id}',
+            'description': f'{customer.full_name if customer else "Customer"} booked "{tour.title[:30] if tour else "Tour"}..."',
+            'created_at': booking.created_at,
+            'icon': 'calendar-check'
+        })
+    
+    # Get recent reviews
+    if user.is_superadmin:
+        recent_reviews = db.scalars(
+            select(Review).options(
+                joinedload(Review.tour).load_only(Tour.title),
+                joinedload(Review.user).load_only(User.full_name)
+            ).order_by(Review.created_at.desc()).limit(limit)
+        ).all()
+    else:
+        recent_reviews = db.scalars(
+            select(Review).where(
+                Review.creator_id == user.id
             ).options(
-                joinedload(Review.tour),
-                joinedload(Review.user)
-            ).order_by(Review.created_at.desc()).limit(limit).all()
-        
-        for review in recent_reviews:
-            activities.append({
-                'type': 'review',
-                'title': f'New Review ({review.rating}★)',
-                'description': f'{review.user.full_name if review.user else "User"} reviewed "{review.tour.title[:30] if review.tour else "Tour"}..."',
-                'time': format_time(review.created_at),
-                'icon': 'star'
-            })
-        
-        # Sort by time and limit
-        activities.sort(key=lambda x: x['time'], reverse=True)
-        activities = activities[:limit]
-        
-        return activities
+                joinedload(Review.tour).load_only(Tour.title),
+                joinedload(Review.user).load_only(User.full_name)
+            ).order_by(Review.created_at.desc()).limit(limit)
+        ).all()
     
-    except Exception as e:
-        return []
+    review_activities = []
+    for review in recent_reviews:
+        reviewer, tour = review.user, review.tour
+        review_activities.append({
+            'type': 'review',
+            'title': f'New Review ({review.rating}★)',
+            'description': f'{reviewer.full_name if reviewer else "User"} reviewed "{tour.title[:30] if tour else "Tour"}..."',
+            'created_at': review.created_at,
+            'icon': 'star'
+        })
+    
+    # Merge the two sorted lists newest first by the actual timestamp
+    # (orjson emits it as ISO 8601), stopping at limit; only the kept
+    # items get the relative "time" label
+    activities = list(itertools.islice(
+        heapq.merge(booking_activities, review_activities,
+                    key=lambda x: x['created_at'] or datetime.min, reverse=True),
+        limit,
+    ))
+    for activity in activities:
+        activity['time'] = format_time(activity['created_at']) if activity['created_at'] else ""
+    
+    return ORJSONResponse(activities)
+
+def _booking_details_query():
+    """Column projection behind the booking details responses."""
+    return select(
+        Booking.id,
+        Booking.creator_id,
+        Booking.adults,
+        Booking.kids,
+        Booking.tour_date,
+        Booking.total_price,
+        Booking.status,
+        Booking.payment_method,
+        Booking.payment_status,
+        Booking.special_requirements,
+        Booking.created_at,
+        Booking.cancelled_at,
+        Tour.id.label('tour_id'),
+        Tour.title,
+        Tour.price,
+        Tour.duration,
+        Tour.country,
+        Tour.primary_image_url,
+        User.id.label('user_id'),
+        User.full_name,
+        User.email,
+        User.phone,
+    ).select_from(Booking).outerjoin(Tour, Booking.tour_id == Tour.id).outerjoin(
+        User, Booking.user_id == User.id
+    )
+
+# Booking details response. Slotted dataclasses are cheaper to build than the
+# nested dict literals and orjson serializes them natively, field order kept.
+@dataclass(slots=True)
+class TourBrief:
+    id: int
+    title: str
+    price: float
+    duration: Optional[str]
+    country: str
+    image: Optional[str]
+
+
+@dataclass(slots=True)
+class CustomerBrief:
+    id: Optional[int]
+    name: Optional[str]
+    email: Optional[str]
+    phone: Optional[str]
+
+
+@dataclass(slots=True)
+class BookingBrief:
+    adults: int
+    kids: int
+    tour_date: Optional[datetime]
+    total_price: Optional[float]
+    status: Optional[str]
+    payment_method: Optional[str]
+    payment_status: Optional[str]
+    special_requirements: Optional[str]
+    created_at: Optional[datetime]
+    cancelled_at: Optional[datetime]
+
+
+@dataclass(slots=True)
+class BookingDetailsResponse:
+    id: int
+    tour: TourBrief
+    customer: CustomerBrief
+    booking_details: BookingBrief
+
+
+def _booking_details(row) -> BookingDetailsResponse:
+    """Response for /admin/booking/{id}/details from its projected row."""
+    return BookingDetailsResponse(
+        id=row.id,
+        tour=TourBrief(
+            id=row.tour_id,
+            title=row.title,
+            price=row.price,
+            duration=row.duration,
+            country=row.country,
+            image=row.primary_image_url,
+        ),
+        customer=CustomerBrief(
+            id=row.user_id,
+            name=row.full_name,
+            email=row.email,
+            phone=row.phone,
+        ),
+        booking_details=BookingBrief(
+            adults=row.adults,
+            kids=row.kids,
+            tour_date=row.tour_date,
+            total_price=row.total_price,
+            status=row.status,
+            payment_method=row.payment_method,
+            payment_status=row.payment_status,
+            special_requirements=row.special_requirements,
+            created_at=row.created_at,
+            cancelled_at=row.cancelled_at,
+        ),
+    )
+
+def _row_etag(row) -> str:
+    """Strong ETag over every column of a projected row: any change to the
+    booking or to the tour/customer fields it shows gives a new tag."""
+    return '"%s"' % hashlib.blake2b(repr(tuple(row)).encode(), digest_size=8).hexdigest()
 
-@router.get('/admin/booking/{booking_id}/details')
-async def get_booking_details(
+
+# Plain def so the query runs in the threadpool, off the event loop
+@router.get('/admin/booking/{booking_id}/details', response_model=None)
+def get_booking_details(
     booking_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_admin)
 ):
     """Get detailed booking information"""
-    try:
-        booking = db.query(Booking).options(
-            joinedload(Booking.tour).joinedload(Tour.images),
-            joinedload(Booking.user)
-        ).filter(Booking.id == booking_id).first()
-        
-        if not booking:
+    # Check permission first with a primary-key lookup of the owner
+    # column (the booking carries its tour's owner), so denied requests
+    # never run the joined details query
+    if not user.is_superadmin:
+        owner = db.execute(
+            select(Booking.creator_id).where(Booking.id == booking_id)
+        ).first()
+        if not owner:
             raise HTTPException(status_code=404, detail="Booking not found")
-        
-        # Check permission
-        tour = booking.tour
-        if not user.is_superadmin and tour.creator_id != user.id:
+        if owner.creator_id != user.id:
             raise HTTPException(status_code=403, detail="Not authorized")
-        
-        booking_details = {
-            'id': booking.id,
-            'tour': {
-                'id': tour.id,
-                'title': tour.title,
-                'price': tour.price,
-                'duration': tour.duration,
-                'country': tour.country,
-                'image': tour.images[0].image_url if tour.images else None
-            },
-            'customer': {
-                'id': booking.user.id,
-                'name': booking.user.full_name,
-                'email': booking.user.email,
-                'phone': booking.user.phone
-            },
-            'booking_details': {
-                'adults': booking.adults,
-                'kids': booking.kids,
-                'tour_date': booking.tour_date.isoformat() if booking.tour_date else None,
-                'total_price': booking.total_price,
-                'status': booking.status,
-                'payment_method': booking.payment_method,
-                'payment_status': booking.payment_status,
-                'special_requirements': booking.special_requirements,
-                'created_at': booking.created_at.isoformat() if booking.created_at else None,
-                'cancelled_at': booking.cancelled_at.isoformat() if booking.cancelled_at else None
-            }
-        }
-        
-        return booking_details
     
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error fetching booking details: {str(e)}")
+    # Just the columns the response uses, as one plain row
+    row = db.execute(
+        _booking_details_query().where(Booking.id == booking_id)
+    ).first()
+    
+    if not row:
+        raise HTTPException(status_code=404, detail="Booking not found")
+    if row.tour_id is None:
+        raise HTTPException(status_code=404, detail="Tour not found")
+    
+    # Polling clients that already hold this version get an empty 304
+    etag = _row_etag(row)
+    if etag in (tag.strip() for tag in request.headers.get('if-none-match', '').split(',')):
+        return Response(status_code=304, headers={'ETag': etag})
+    
+    # Returned as a response so it skips jsonable_encoder
+    return ORJSONResponse(_booking_details(row), headers={'ETag': etag})
+
+@router.get('/admin/bookings/details-bulk', response_model=None)
+def get_booking_details_bulk(user: User = Depends(get_current_admin)):
+    """Stream the details of every booking the admin can see as NDJSON"""
+    query = _booking_details_query().where(Tour.id.isnot(None)).order_by(Booking.created_at.desc())
+    if not user.is_superadmin:
+        query = query.where(Booking.creator_id == user.id)
+
+    def records():
+        # Own session: the request's one is closed before the body is sent.
+        # Rows come off the cursor 200 at a time and each is encoded and
+        # sent on its own, so the full list never sits in memory.
+        with SessionLocal.session_factory() as db:
+            for row in db.execute(query.execution_options(yield_per=200)):
+                yield orjson.dumps(_booking_details(row), option=orjson.OPT_APPEND_NEWLINE)
+
+    return StreamingResponse(records(), media_type="application/x-ndjson")
 
 @router.get('/admin/bookings/export')
 async def export_bookings(
@@ -1148,38 +1228,47 @@ async def export_bookings(
     try:
         # Get bookings based on user role
         if user.is_superadmin:
-            bookings = db.query(Booking).options(
-                joinedload(Booking.tour),
-                joinedload(Booking.user)
-            ).order_by(Booking.created_at.desc()).all()
+            bookings = db.scalars(
+                select(Booking).options(
+                    joinedload(Booking.tour).load_only(Tour.title),
+                    joinedload(Booking.user).load_only(User.full_name, User.email)
+                ).order_by(Booking.created_at.desc())
+            ).all()
         else:
-            bookings = db.query(Booking).join(Tour).filter(
-                Tour.creator_id == user.id
-            ).options(
-                joinedload(Booking.tour),
-                joinedload(Booking.user)
-            ).order_by(Booking.created_at.desc()).all()
+            bookings = db.scalars(
+                select(Booking).where(
+                    Booking.creator_id == user.id
+                ).options(
+                    joinedload(Booking.tour).load_only(Tour.title),
+                    joinedload(Booking.user).load_only(User.full_name, User.email)
+                ).order_by(Booking.created_at.desc())
+            ).all()
         
-        # Prepare data
+        # Prepare data. JSON keeps the datetimes for orjson to encode; only
+        # the CSV needs them as ISO strings up front
+        as_json = format.lower() == 'json'
+        stamp = (lambda dt: dt) if as_json else datetime.isoformat
         export_data = []
         for booking in bookings:
+            # Related objects read once per row
+            tour, customer = booking.tour, booking.user
             export_data.append({
                 'Booking ID': booking.id,
-                'Tour': booking.tour.title if booking.tour else 'N/A',
-                'Customer': booking.user.full_name if booking.user else 'N/A',
-                'Email': booking.user.email if booking.user else 'N/A',
-                'Tour Date': booking.tour_date.isoformat() if booking.tour_date else 'N/A',
+                'Tour': tour.title if tour else 'N/A',
+                'Customer': customer.full_name if customer else 'N/A',
+                'Email': customer.email if customer else 'N/A',
+                'Tour Date': stamp(booking.tour_date) if booking.tour_date else 'N/A',
                 'Adults': booking.adults,
                 'Kids': booking.kids,
                 'Total Price': booking.total_price,
                 'Status': booking.status,
                 'Payment Method': booking.payment_method,
                 'Payment Status': booking.payment_status,
-                'Created At': booking.created_at.isoformat() if booking.created_at else 'N/A'
+                'Created At': stamp(booking.created_at) if booking.created_at else 'N/A'
             })
         
-        if format.lower() == 'json':
-            return JSONResponse(
+        if as_json:
+            return ORJSONResponse(
                 content=export_data,
                 media_type="application/json"
             )
@@ -1193,7 +1282,7 @@ async def export_bookings(
             writer.writeheader()
             writer.writerows(export_data)
             
-            return JSONResponse(
+            return ORJSONResponse(
                 content={"csv": output.getvalue()},
                 media_type="application/json"
             )
@@ -1214,14 +1303,14 @@ async def export_revenue_report(
         analytics = await get_revenue_analytics(period, db, user)
         
         if format.lower() == 'json':
-            return JSONResponse(
+            return ORJSONResponse(
                 content=analytics,
                 media_type="application/json"
             )
         else:
             # For PDF, you would typically use a PDF generation library
             # This is a simplified version returning JSON
-            return JSONResponse(
+            return ORJSONResponse(
                 content={
                     "message": "PDF export not implemented",
                     "data": analytics
@@ -10,9 +10,9 @@ from fastapi import APIRouter, Request, Depends, HTTPException, status, Form
 from fastapi.responses import HTMLResponse, RedirectResponse
 from sqlalchemy.orm import Session
 from app.models import User
-from app.utils import get_current_user, create_session, delete_session, verify_password, hash_password, send_email,is_superadmin
+from app.utils import get_current_user, create_session, delete_session, verify_password_async, hash_password_async, send_email,is_superadmin
 from app.database import get_db
-from fastapi.templating import Jinja2Templates
+from app.templating import templates
 from sqlalchemy import func
 
 
@@ -187,7 +187,7 @@ async def google_callback(request: Request, db: Session = Depends(get_db)):
         else:
             # Create new user
             random_password = secrets.token_urlsafe(32)
-            hashed_password = hash_password(random_password)
+            hashed_password = await hash_password_async(random_password)
             
             # ✅ Create user with picture if the field exists
             user_data = {
@@ -308,7 +308,6 @@ async def verify_apple_token(id_token: str) -> dict:
         raise HTTPException(status_code=400, detail="Invalid Apple token")
 
 
-templates = Jinja2Templates(directory="app/templates", auto_reload=True)
 temporary_reset_tokens = {}
 BASE_URL = os.getenv("BASE_URL", "http://localhost:8000")
 
@@ -329,7 +328,7 @@ async def signup(request: Request, db: Session = Depends(get_db)):
     if db.query(User).filter(User.email == email).first():
         return templates.TemplateResponse("signup.html", {"request": request, "error": "Email already exists"})
     
-    hashed_password = hash_password(password)
+    hashed_password = await hash_password_async(password)
     new_user = User(email=email, hashed_password=hashed_password, full_name=full_name)
     db.add(new_user)
     db.commit()
@@ -348,7 +347,7 @@ async def login(request: Request, db: Session = Depends(get_db)):
     
     user = db.query(User).filter(User.email == email).first()
     
-    if not user or not verify_password(password, user.hashed_password):
+    if not user or not await verify_password_async(password, user.hashed_password):
         return templates.TemplateResponse("login.html", {"request": request, "error": "Invalid email or password"})
     
     session_id = create_session(db, user.id)
@@ -507,7 +506,7 @@ async def reset_password_post(
             error = "User not found"
             raise ValueError
 
-        hashed_password = hash_password(new_password)
+        hashed_password = await hash_password_async(new_password)
         user.hashed_password = hashed_password
         db.commit()
         db.refresh(user)
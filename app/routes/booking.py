@@ -1,16 +1,15 @@
 from datetime import datetime, timedelta
 from fastapi import APIRouter, Request, Depends, HTTPException, Form
 from fastapi.responses import HTMLResponse, RedirectResponse
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import or_, and_
 from typing import Optional
 from app.models import User, Tour, Booking
 from app.utils import get_current_user, send_email
 from app.database import get_db
-from fastapi.templating import Jinja2Templates
+from app.templating import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates", auto_reload=True)
 
 @router.get("/book/{tour_id}", response_class=HTMLResponse)
 async def book_tour(
@@ -19,7 +18,7 @@ async def book_tour(
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user)
 ):
-    tour = db.query(Tour).options(joinedload(Tour.images)).filter(Tour.id == tour_id).first()
+    tour = db.get(Tour, tour_id, options=[selectinload(Tour.images)])
     if not tour:
         return RedirectResponse(url="/tours", status_code=303)
 
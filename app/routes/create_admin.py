@@ -5,13 +5,12 @@ from fastapi import APIRouter, Request, Depends, HTTPException, status, Form
 from fastapi.responses import HTMLResponse, RedirectResponse
 from sqlalchemy.orm import Session
 from app.models import User
-from app.utils import get_current_user, create_session, delete_session, verify_password, hash_password, send_email
+from app.utils import get_current_user, create_session, delete_session, hash_password_async, send_email
 from app.database import get_db
-from fastapi.templating import Jinja2Templates
+from app.templating import templates
 from sqlalchemy import func
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates", auto_reload=True)
 
 @router.get("/admin/register", response_class=HTMLResponse)
 async def get_admin_register(request: Request):
@@ -44,7 +43,7 @@ async def register_admin(
             })
         
         # Create new admin user
-        hashed_password = hash_password(password)
+        hashed_password = await hash_password_async(password)
         new_admin = User(
             email=email,
             hashed_password=hashed_password,
@@ -9,14 +9,13 @@ from datetime import datetime
 
 from fastapi import APIRouter, Request, Depends
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
-from sqlalchemy.orm import Session, joinedload   # <-- joinedload added for images
+from app.templating import templates
+from sqlalchemy.orm import Session, selectinload
 
 from app.database import get_db
 from app import models  # we assume you (or the original dev) defined these
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates", auto_reload=True)
 
 
 @router.get("/cultures", response_class=HTMLResponse)
@@ -39,10 +38,11 @@ async def show_cultures(
     # 1. LOAD COUNTRIES / REGIONS
     # --------------------------------------------------------
     # Uses the Country model you added (by Bammez).
-    # Now we also preload related CountryImage rows via joinedload.
+    # Related CountryImage rows come in one extra IN query (selectinload),
+    # so the long country text columns aren't repeated per image.
     countries_db = (
         db.query(models.Country)
-        .options(joinedload(models.Country.images))  # <-- Added for image relationship
+        .options(selectinload(models.Country.images))
         .order_by(models.Country.name)
         .all()
     )
@@ -2,18 +2,16 @@
 # Routes for managing culture content only
 
 import os
-import uuid
 from fastapi import APIRouter, Depends, Request, UploadFile, File, Form, HTTPException
 from fastapi.responses import RedirectResponse, HTMLResponse
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models import Country, CountryImage, User
-from app.utils import get_current_admin
-from fastapi.templating import Jinja2Templates
+from app.utils import get_current_admin, save_upload, is_image_upload
+from app.templating import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
 
 UPLOAD_DIR = "static/uploads/cultures"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
@@ -209,15 +207,12 @@ async def upload_culture_image(
     file_ext = os.path.splitext(image.filename)[1].lower()
     if file_ext not in allowed_extensions:
         raise HTTPException(status_code=400, detail="Invalid image format. Use JPG, PNG, or WEBP")
+    if not await is_image_upload(image):
+        raise HTTPException(status_code=400, detail="File is not a valid image")
     
     # Save file
-    filename = f"{uuid.uuid4()}{file_ext}"
-    filepath = os.path.join(UPLOAD_DIR, filename)
-    
     try:
-        contents = await image.read()
-        with open(filepath, "wb") as f:
-            f.write(contents)
+        filename = await save_upload(image, UPLOAD_DIR)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to save image: {str(e)}")
     
@@ -7,7 +7,6 @@ from app.models import User, Booking, MessageStatus, UserRole
 from app.crud.message import MessageCRUD
 from app.schemas.message import MessageCreate, MessageUpdate, MessageWithUsers, Conversation
 import logging
-from datetime import datetime
 
 router = APIRouter(prefix="/api/messages", tags=["messaging"])
 logger = logging.getLogger(__name__)
@@ -84,20 +83,9 @@ async def get_messages(
     if unread_only:
         messages = [msg for msg in messages if msg.status == MessageStatus.UNREAD and msg.receiver_id == current_user.id]
     
-    result = []
-    for msg in messages:
-        sender = crud.db.query(User).filter(User.id == msg.sender_id).first()
-        receiver = crud.db.query(User).filter(User.id == msg.receiver_id).first()
-        
-        # FIX: use full_name
-        result.append(MessageWithUsers(
-            **msg.__dict__,
-            sender_name=sender.full_name or sender.email,
-            receiver_name=receiver.full_name or receiver.email,
-            booking_reference=msg.booking.booking_reference if msg.booking else None
-        ))
-    
-    return result
+    # Rows already carry sender_name/receiver_name. Bookings have no
+    # reference number yet, so booking_reference stays unset.
+    return [MessageWithUsers(**msg._mapping) for msg in messages]
 
 @router.get("/conversations", response_model=List[Conversation])
 async def get_conversations(
@@ -105,55 +93,21 @@ async def get_conversations(
     crud: MessageCRUD = Depends(get_message_crud)
 ):
     """Get all conversations for current user"""
-    db = crud.db
-    conversations = []
-    
-    # Get all users the current user has conversed with
-    other_user_ids = crud.get_conversations(current_user.id)
-    
-    for other_id in other_user_ids:
-        other_user = db.query(User).filter(User.id == other_id).first()
-        if not other_user:
-            continue
-        
-        # Get last message in conversation
-        messages = crud.get_conversation(current_user.id, other_id)
-        if not messages:
-            continue
-        
-        last_msg = messages[-1]
-        
-        # Get unread count
-        unread_count = sum(1 for msg in messages 
-                          if msg.receiver_id == current_user.id and msg.status == MessageStatus.UNREAD)
-        
-        # Get common booking if exists
-        common_booking = None
-        booking_title = None
-        for msg in messages:
-            if msg.booking_id:
-                booking = db.query(Booking).filter(Booking.id == msg.booking_id).first()
-                if booking:
-                    common_booking = msg.booking_id
-                    booking_title = booking.tour.title if booking.tour else None
-                    break
-        
-        # FIX: use full_name
-        conversations.append(Conversation(
-            booking_id=common_booking,
-            other_user_id=other_id,
-            other_user_name=other_user.full_name or other_user.email,
-            other_user_role=other_user.role,
-            other_user_company=other_user.company_name,
-            last_message=last_msg.content[:100] + "..." if len(last_msg.content) > 100 else last_msg.content,
-            last_message_time=last_msg.created_at,
-            unread_count=unread_count,
-            booking_title=booking_title
-        ))
-    
-    # Sort by last message time (newest first)
-    conversations.sort(key=lambda x: x.last_message_time or datetime.min, reverse=True)
-    return conversations
+    # Latest message, unread count and booking per peer in one query
+    return [
+        Conversation(
+            booking_id=row.booking_id,
+            other_user_id=row.User.id,
+            other_user_name=row.User.full_name or row.User.email,
+            other_user_role=row.User.role,
+            other_user_company=row.User.company_name,
+            last_message=row.last_message[:100] + "..." if len(row.last_message) > 100 else row.last_message,
+            last_message_time=row.last_message_time,
+            unread_count=row.unread_count or 0,
+            booking_title=row.booking_title
+        )
+        for row in crud.get_inbox(current_user.id)
+    ]
 
 @router.get("/conversation/{other_user_id}", response_model=List[MessageWithUsers])
 async def get_conversation(
@@ -163,23 +117,10 @@ async def get_conversation(
     crud: MessageCRUD = Depends(get_message_crud)
 ):
     """Get conversation with specific user"""
-    db = crud.db
     messages = crud.get_conversation(current_user.id, other_user_id, booking_id)
     
-    result = []
-    for msg in messages:
-        sender = db.query(User).filter(User.id == msg.sender_id).first()
-        receiver = db.query(User).filter(User.id == msg.receiver_id).first()
-        
-        # FIX: use full_name
-        result.append(MessageWithUsers(
-            **msg.__dict__,
-            sender_name=sender.full_name or sender.email,
-            receiver_name=receiver.full_name or receiver.email,
-            booking_reference=msg.booking.booking_reference if msg.booking else None
-        ))
-    
-    return result
+    # Same projected rows as get_messages: names included, booking_reference unset
+    return [MessageWithUsers(**msg._mapping) for msg in messages]
 
 @router.put("/{message_id}/read", response_model=MessageWithUsers)
 async def mark_message_as_read(
@@ -188,21 +129,13 @@ async def mark_message_as_read(
     crud: MessageCRUD = Depends(get_message_crud)
 ):
     """Mark a message as read"""
-    db = crud.db
     message = crud.mark_as_read(message_id, current_user.id)
     if not message:
         raise HTTPException(status_code=404, detail="Message not found or you don't have permission")
     
-    sender = db.query(User).filter(User.id == message.sender_id).first()
-    receiver = db.query(User).filter(User.id == message.receiver_id).first()
-    
-    # FIX: use full_name
-    return MessageWithUsers(
-        **message.__dict__,
-        sender_name=sender.full_name or sender.email,
-        receiver_name=receiver.full_name or receiver.email,
-        booking_reference=message.booking.booking_reference if message.booking else None
-    )
+    # The row already carries sender_name/receiver_name; booking_reference
+    # stays unset as in get_messages.
+    return MessageWithUsers(**message._mapping)
 
 @router.get("/unread/count")
 async def get_unread_count(
@@ -3,12 +3,11 @@ from fastapi import APIRouter, Request, Depends, Query
 from fastapi.responses import HTMLResponse, RedirectResponse
 from sqlalchemy.orm import Session
 from app.models import User
-from app.utils import get_current_user
+from app.utils import get_current_user, is_uuid
 from app.database import get_db
-from fastapi.templating import Jinja2Templates
+from app.templating import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates", auto_reload=True)
 
 @router.get("/subscribe_newsletter", response_class=HTMLResponse)
 @router.post("/subscribe_newsletter", response_class=HTMLResponse)
@@ -44,7 +43,7 @@ async def unsubscribe_newsletter(
     token: str = Query(..., description="Unsubscribe token"),
     db: Session = Depends(get_db)
 ):
-    user = db.query(User).filter(User.unsubscribe_token == token).first()
+    user = db.query(User).filter(User.unsubscribe_token == token).first() if is_uuid(token) else None
     if not user:
         return templates.TemplateResponse("error.html", {
             "request": request,
@@ -7,11 +7,11 @@ from sqlalchemy.orm import Session
 from app.models import User, Tour, Booking
 from app.utils import get_current_user, send_email
 from app.database import get_db
-from fastapi.templating import Jinja2Templates
+from app.cache import invalidate_stats
+from app.templating import templates
 from dotenv import load_dotenv
 load_dotenv()
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates", auto_reload = True)
 stripe.api_key = os.getenv("STRIPE_SECRET_KEY")
 
 BASE_URL = os.getenv("BASE_URL", "http://localhost:8000").rstrip("/")
@@ -143,6 +143,7 @@ async def payment_success(
 
         db.add(new_booking)
         db.commit()
+        invalidate_stats(new_booking.creator_id)
 
         # 6️⃣ Clear booking session safely
         request.session.pop("booking", None)
@@ -203,6 +204,7 @@ async def complete_booking(
         
         db.add(new_booking)
         db.commit()
+        invalidate_stats(new_booking.creator_id)
         
         # Send confirmation email with special requirements
         special_reqs = booking_data.get('special_requirements')
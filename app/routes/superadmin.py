@@ -1,8 +1,8 @@
 # app/routes/superadmin.py
 from fastapi import APIRouter, Request, Depends, HTTPException, status, Form, Query
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
-from sqlalchemy.orm import Session, joinedload
+from app.templating import templates
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import or_, extract, func
 from datetime import datetime, timedelta
 import json
@@ -12,7 +12,6 @@ from app.models import User, Booking, Tour, Country, CountryImage
 from app.utils import get_current_superadmin, get_dashboard_stats, get_recent_bookings, get_top_tours
 
 router = APIRouter(prefix="/superadmin", tags=["superadmin"])
-templates = Jinja2Templates(directory="app/templates")
 
 # ============ SUPERADMIN CORE ROUTES ============
 
@@ -234,9 +233,10 @@ async def superadmin_culture_dashboard(
     superadmin: User = Depends(get_current_superadmin)
 ):
     """Super admin culture management dashboard"""
-    # Get all countries with images
+    # Get all countries with images (one IN query for all the images
+    # instead of repeating each country's columns per image row)
     countries = db.query(Country).options(
-        joinedload(Country.images)
+        selectinload(Country.images)
     ).order_by(Country.name).all()
     
     return templates.TemplateResponse(
@@ -18,7 +18,7 @@
 
 from fastapi import APIRouter, Request, Depends, HTTPException, status, Form
 from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
+from app.templating import templates
 from sqlalchemy.orm import Session
 from typing import Optional
 import re
@@ -28,11 +28,10 @@ from app.models import User
 from app.utils import (
     get_current_user,
     get_current_superadmin,
-    hash_password,
+    hash_password_async,
 )
 
 router = APIRouter(prefix="/superadmin", tags=["superadmin-creation"])
-templates = Jinja2Templates(directory="app/templates")
 
 # =========================================================
 # BOOTSTRAP HELPERS (SINGLE SOURCE OF TRUTH)
@@ -188,7 +187,7 @@ async def create_superadmin(
     try:
         new_superadmin = User(
             email=email.strip().lower(),
-            hashed_password=hash_password(password),
+            hashed_password=await hash_password_async(password),
             full_name=full_name.strip(),
             company_name=company_name.strip() if company_name else None,
             company_link=company_link.strip() if company_link else None,
@@ -4,10 +4,9 @@ from sqlalchemy.orm import Session
 from app.models import Tour, User
 from app.utils import get_current_user
 from app.database import get_db
-from fastapi.templating import Jinja2Templates
+from app.templating import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates", auto_reload=True)
 
 @router.get("/tour/{tour_id}", response_class=HTMLResponse)
 async def tour_details_page(
@@ -4,11 +4,10 @@ from sqlalchemy.orm import Session
 from app.models import Tour, User
 from app.utils import get_current_user
 from app.database import get_db
-from fastapi.templating import Jinja2Templates
+from app.templating import templates
 from sqlalchemy import func
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates", auto_reload=True)
 
 @router.get("/", response_class=HTMLResponse)
 async def read_root(
@@ -0,0 +1,65 @@
+# app/tasks.py
+# Jobs for the arq worker (`arq app.tasks.WorkerSettings`): slow work such as
+# newsletter mail runs in its own process instead of after the response on a
+# web worker. Without REDIS_URL (local development, tests) there is no queue
+# and jobs fall back to FastAPI BackgroundTasks in the web process.
+
+import asyncio
+from typing import Optional
+
+from arq import create_pool, cron
+from arq.connections import ArqRedis, RedisSettings
+from fastapi import BackgroundTasks
+
+from app.analytics import refresh_revenue_view, refresh_tour_stats_view
+from app.config import get_settings
+from app.database import SessionLocal
+from app.utils import notify_subscribers
+
+settings = get_settings()
+
+
+def notify_subscribers_job(tour_id: int) -> None:
+    """Mail newsletter subscribers about a new tour. Opens its own session:
+    the request's session is gone by the time this runs."""
+    with SessionLocal.session_factory() as db:
+        notify_subscribers(db, tour_id)
+
+
+async def notify_subscribers_task(ctx, tour_id: int) -> None:
+    # SMTP is blocking, keep it off the worker's event loop
+    await asyncio.to_thread(notify_subscribers_job, tour_id)
+
+
+async def refresh_tour_stats_task(ctx) -> None:
+    await asyncio.to_thread(refresh_tour_stats_view)
+
+
+async def refresh_revenue_task(ctx) -> None:
+    await asyncio.to_thread(refresh_revenue_view)
+
+
+class WorkerSettings:
+    functions = [notify_subscribers_task]
+    # Materialized views behind the admin dashboard (Postgres; no-ops elsewhere)
+    cron_jobs = [
+        cron(refresh_tour_stats_task, minute=set(range(0, 60, 5))),
+        cron(refresh_revenue_task, hour=0, minute=10),
+    ]
+    redis_settings = RedisSettings.from_dsn(settings.redis_url) if settings.redis_url else RedisSettings()
+
+
+async def connect_queue() -> Optional[ArqRedis]:
+    """Redis connection for enqueueing jobs, or None without REDIS_URL."""
+    if not settings.redis_url:
+        return None
+    return await create_pool(WorkerSettings.redis_settings)
+
+
+async def enqueue_notify_subscribers(
+    queue: Optional[ArqRedis], background_tasks: BackgroundTasks, tour_id: int
+) -> None:
+    if queue is None:
+        background_tasks.add_task(notify_subscribers_job, tour_id)
+    else:
+        await queue.enqueue_job("notify_subscribers_task", tour_id)
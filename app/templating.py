@@ -0,0 +1,46 @@
+# app/templating.py
+# One Jinja environment shared by every router, so templates are parsed once
+# per process instead of once per module that renders them.
+
+from datetime import date
+from functools import lru_cache
+
+from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+from app.config import get_settings
+
+TEMPLATE_DIR = "app/templates"
+
+settings = get_settings()
+
+templates = Jinja2Templates(env=Environment(
+    loader=FileSystemLoader(TEMPLATE_DIR),
+    autoescape=True,
+    # Re-stat template files on every render only while developing
+    auto_reload=settings.debug,
+    cache_size=400,
+    # Compiled template bytecode survives restarts and is shared by workers
+    bytecode_cache=FileSystemBytecodeCache(),
+))
+
+
+@lru_cache(maxsize=4096)
+def _format_day(ordinal: int, fmt: str) -> str:
+    return date.fromordinal(ordinal).strftime(fmt)
+
+
+def format_date(value: date, fmt: str = "%Y-%m-%d") -> str:
+    """`{{ value|date }}` / `{{ value|date('%B %d, %Y') }}` for date-only
+    formats. Memoized per calendar day: list pages repeat the same few dates,
+    so most rows become a cache hit instead of a strftime call."""
+    return _format_day(value.toordinal(), fmt)
+
+
+templates.env.filters["date"] = format_date
+
+
+def warm_templates() -> None:
+    """Compile every template up front so first renders don't parse."""
+    for name in templates.env.list_templates(extensions=["html"]):
+        templates.env.get_template(name)
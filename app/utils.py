@@ -1,13 +1,16 @@
+import asyncio
 import bcrypt
 import os
+import shutil
+import uuid
 import smtplib
 from dotenv import load_dotenv
 from email.message import EmailMessage
 from datetime import datetime, timedelta
-from fastapi import Request, HTTPException, status, Depends
+from fastapi import Request, HTTPException, status, Depends, UploadFile
 from sqlalchemy.orm import Session
 from app.models import User, Session, Tour, Booking
-from sqlalchemy import func, or_, and_
+from sqlalchemy import func, or_, and_, select
 from fastapi import Request
 from app.database import get_db
 from typing import Optional,List
@@ -20,14 +23,84 @@ base = BASE_URL.rstrip('/')
 
 
 SESSION_EXPIRE_MINUTES = 30
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
 load_dotenv()
 
+# bcrypt cost for new hashes (2^12 rounds); existing hashes keep their own
+BCRYPT_ROUNDS = 12
+
 def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode('utf-8')
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
 
+# Route handlers use these: bcrypt is deliberately slow (~0.2s of CPU) and
+# would block every other request on the event loop meanwhile. bcrypt
+# releases the GIL, so concurrent logins hash in parallel.
+async def hash_password_async(password: str) -> str:
+    return await asyncio.to_thread(hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await asyncio.to_thread(verify_password, plain_password, hashed_password)
+
+
+def _copy_upload(src, path: str) -> None:
+    src.seek(0)
+    with open(path, "wb") as out:
+        shutil.copyfileobj(src, out, UPLOAD_CHUNK_SIZE)
+
+
+async def save_upload(upload: UploadFile, upload_dir: str) -> str:
+    """Copy an upload to a uuid-named file in upload_dir and return the filename.
+
+    Memory stays bounded by UPLOAD_CHUNK_SIZE whatever the file size. The
+    whole copy runs in one worker thread straight from the spooled temp file,
+    so the event loop (and other uploads saved concurrently) is never blocked
+    and there is no thread hop per chunk."""
+    file_ext = os.path.splitext(upload.filename)[1].lower()
+    filename = f"{uuid.uuid4()}{file_ext}"
+    await asyncio.to_thread(_copy_upload, upload.file, os.path.join(upload_dir, filename))
+    return filename
+
+
+# Declared content types accepted for image uploads
+ALLOWED_IMAGE_TYPES = {"image/jpeg", "image/png", "image/gif", "image/webp"}
+
+
+def _sniff_image_type(head: bytes) -> Optional[str]:
+    """Image format from the first 12 bytes of a file, or None."""
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head.startswith((b"GIF87a", b"GIF89a")):
+        return "image/gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+async def is_image_upload(upload: UploadFile) -> bool:
+    """Reject non-images before anything is written to disk: the declared
+    content type must be whitelisted and the leading bytes must match a known
+    image format. Only 12 bytes are read, then the upload is rewound."""
+    if upload.content_type not in ALLOWED_IMAGE_TYPES:
+        return False
+    head = await upload.read(12)
+    await upload.seek(0)
+    return _sniff_image_type(head) is not None
+
+
+def is_uuid(value: str) -> bool:
+    """Session ids and unsubscribe tokens are uuid columns on Postgres, so
+    anything else must be rejected before it reaches a query."""
+    try:
+        uuid.UUID(value)
+    except (TypeError, ValueError):
+        return False
+    return True
+
 
 def create_session(db: Session, user_id: int) -> str:
     # Delete existing sessions for the user
@@ -42,25 +115,34 @@ def create_session(db: Session, user_id: int) -> str:
     db.commit()
     return session.id
 
+_UNRESOLVED = object()
+
 def get_current_user(request: Request, db: Session = Depends(get_db)) -> User:
+    # Resolved once per request: get_current_admin/superadmin call this
+    # directly, so FastAPI's dependency cache doesn't cover them
+    user = getattr(request.state, "current_user", _UNRESOLVED)
+    if user is not _UNRESOLVED:
+        return user
+
     session_id = request.cookies.get("auth_session_id")
     print(f"auth_Session ID from cookies: {session_id}")
-    if not session_id:
+    if not session_id or not is_uuid(session_id):
         return None
     
-    session = db.query(Session).filter(
-        Session.id == session_id,
-        Session.expires_at > datetime.utcnow()
-    ).first()
-    
-    if not session:
-        return None
-    
-    user = db.query(User).filter(User.id == session.user_id).first()
+    # The live session and its user in one round trip
+    user = db.scalar(
+        select(User).join(Session, Session.user_id == User.id).where(
+            Session.id == session_id,
+            Session.expires_at > datetime.utcnow()
+        )
+    )
     print(f"Current user: {user}")
+    request.state.current_user = user
     return user
 
 def delete_session(db: Session, session_id: str):
+    if not is_uuid(session_id):
+        return
     db.query(Session).filter(Session.id == session_id).delete()
     db.commit()
     
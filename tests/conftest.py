@@ -0,0 +1,5 @@
+import os
+
+# The app no longer creates tables on import; the route tests run against the
+# local SQLite database, so opt in to the development shortcut.
+os.environ.setdefault("DEV_AUTO_MIGRATE", "1")
@@ -0,0 +1,80 @@
+from datetime import datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.analytics import dashboard_totals, revenue_series, top_tours
+from app.models import Base, Booking, Review, Tour, User
+
+
+def test_revenue_series_buckets_confirmed_revenue():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+
+    now = datetime.utcnow()
+    owner, other = User(email="a@x.com"), User(email="b@x.com")
+    db.add_all([owner, other])
+    db.flush()
+    tour = Tour(title="t", price=1, country="UG", included="-", not_included="-",
+                cancellation_policy="-", creator_id=owner.id)
+    other_tour = Tour(title="o", price=1, country="UG", included="-", not_included="-",
+                      cancellation_policy="-", creator_id=other.id)
+    db.add_all([tour, other_tour])
+    db.flush()
+    db.add_all([
+        Booking(tour_id=tour.id, total_price=100, status="confirmed", created_at=now),
+        Booking(tour_id=tour.id, total_price=50, status="pending", created_at=now),
+        Booking(tour_id=other_tour.id, total_price=7, status="confirmed", created_at=now),
+        Booking(tour_id=tour.id, total_price=20, status="confirmed", created_at=datetime(now.year - 1, 6, 15)),
+    ])
+    db.commit()
+
+    labels, data = revenue_series(db, "monthly", creator_id=owner.id)
+    assert len(labels) == 12 and labels[-1] == now.strftime("%b %Y")
+    assert data[-1] == 100
+
+    labels, data = revenue_series(db, "yearly")
+    assert labels[-2:] == [str(now.year - 1), str(now.year)]
+    assert data[-2:] == [20, 107]
+
+    labels, data = revenue_series(db, "quarterly")
+    assert len(labels) == 4 and data[-1] == 107
+    db.close()
+
+
+def test_dashboard_totals_and_top_tours_live():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+
+    owner, other = User(email="a@x.com"), User(email="b@x.com")
+    db.add_all([owner, other])
+    db.flush()
+    tour = Tour(title="t", price=1, country="UG", included="-", not_included="-",
+                cancellation_policy="-", creator_id=owner.id)
+    other_tour = Tour(title="o", price=1, country="UG", included="-", not_included="-",
+                      cancellation_policy="-", creator_id=other.id)
+    db.add_all([tour, other_tour])
+    db.flush()
+    db.add_all([
+        Booking(tour_id=tour.id, total_price=100, status="confirmed"),
+        Booking(tour_id=tour.id, total_price=50, status="pending"),
+        Booking(tour_id=other_tour.id, total_price=7, status="confirmed"),
+        Review(tour_id=tour.id, user_id=other.id, rating=5),
+        Review(tour_id=tour.id, user_id=other.id, rating=3),
+    ])
+    db.commit()
+
+    totals = dashboard_totals(db, creator_id=owner.id)
+    assert (totals.bookings, totals.pending, totals.confirmed, totals.revenue) == (2, 1, 1, 100)
+    assert (totals.reviews, totals.average, totals.rating_5, totals.rating_3) == (2, 4, 1, 1)
+    assert totals.as_of is None
+    assert dashboard_totals(db).revenue == 107
+
+    assert top_tours(db) == [
+        {"title": "t", "revenue": 100, "image": None},
+        {"title": "o", "revenue": 7, "image": None},
+    ]
+    assert [row["title"] for row in top_tours(db, creator_id=other.id)] == ["o"]
+    db.close()
@@ -0,0 +1,53 @@
+from app.cache import tour_cache, dashboard_tours_key, tour_key, invalidate_tour
+
+
+def test_invalidate_tour_drops_tour_and_both_dashboards():
+    other = dashboard_tours_key(99)
+    for key in (tour_key(1), dashboard_tours_key(None), dashboard_tours_key(7), other):
+        tour_cache.set(key, "cached")
+
+    invalidate_tour(1, creator_id=7)
+
+    assert tour_cache.get_or_create(tour_key(1), lambda: "fresh") == "fresh"
+    assert tour_cache.get_or_create(dashboard_tours_key(None), lambda: "fresh") == "fresh"
+    assert tour_cache.get_or_create(dashboard_tours_key(7), lambda: "fresh") == "fresh"
+    # Other operators' dashboards stay cached
+    assert tour_cache.get_or_create(other, lambda: "fresh") == "cached"
+    tour_cache.delete_multi([tour_key(1), dashboard_tours_key(None), dashboard_tours_key(7), other])
+
+
+def test_invalidate_stats_drops_shared_and_operator_entries():
+    from app.cache import stats_cache, stats_key, invalidate_stats
+    keep = stats_key(99, "overview")
+    for key in (stats_key(None, "overview"), stats_key(7, "revenue|monthly"), keep):
+        stats_cache.set(key, "cached")
+
+    invalidate_stats(7)
+
+    assert stats_cache.get_or_create(stats_key(None, "overview"), lambda: "fresh") == "fresh"
+    assert stats_cache.get_or_create(stats_key(7, "revenue|monthly"), lambda: "fresh") == "fresh"
+    assert stats_cache.get_or_create(keep, lambda: "fresh") == "cached"
+    invalidate_stats(7, 99)
+
+
+def test_dashboard_pages_retire_with_their_operator_data():
+    from app.cache import dashboard_page_key, invalidate_stats
+    operator, other, everyone = (dashboard_page_key(1, 7, "v"), dashboard_page_key(2, 99, "v"),
+                                 dashboard_page_key(3, None, "v"))
+
+    invalidate_stats(7)
+
+    assert dashboard_page_key(1, 7, "v") != operator
+    assert dashboard_page_key(3, None, "v") != everyone
+    assert dashboard_page_key(2, 99, "v") == other
+
+    invalidate_tour(1, creator_id=99)
+    assert dashboard_page_key(2, 99, "v") != other
+    invalidate_stats(7, 99)
+
+
+def test_dashboard_pages_are_not_kept_in_process_memory():
+    from app.cache import page_cache
+    # No REDIS_URL here: a memory store would never evict retired pages
+    page_cache.set("dashboard-page|1|gen|v", "cached")
+    assert page_cache.get_or_create("dashboard-page|1|gen|v", lambda: "fresh") == "fresh"
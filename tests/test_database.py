@@ -1,6 +1,7 @@
+import gc
 import pytest
 from sqlalchemy import text
-from app.database import get_db, SessionLocal
+from app.database import get_db, SessionLocal, _engine_options
 from sqlalchemy.orm import Session
 
 def test_get_db_yields_session():
@@ -27,4 +28,59 @@ def test_get_db_yields_session():
 def test_sessionlocal_instance():
     session = SessionLocal()
     assert isinstance(session, Session)
-    session.close()
\ No newline at end of file
+    session.close()
+
+def test_engine_options_per_supabase_pooler_mode():
+    transaction = _engine_options("postgresql+psycopg2://u:p@pooler.supabase.com:6543/postgres")
+    session = _engine_options("postgresql+psycopg2://u:p@pooler.supabase.com:5432/postgres")
+
+    assert transaction["pool_pre_ping"] is False
+    assert transaction["pool_recycle"] == 60
+    assert session["pool_pre_ping"] is True
+    assert session["pool_size"] == 3
+    assert _engine_options("sqlite:///./test.db") == {"pool_pre_ping": True}
+
+
+def test_engine_options_for_mysql_pool():
+    options = _engine_options("mysql+pymysql://u:p@db:3306/tours")
+    assert options["pool_size"] == 10
+    assert options["max_overflow"] == 20
+    assert options["pool_recycle"] == 1800
+    assert _engine_options("mysql+pymysql://u:p@db:3306/tours", pool_size=4)["pool_size"] == 4
+
+
+def test_warm_pool_checks_connections_back_in():
+    from app.database import engine, warm_pool
+
+    gc.collect()  # return connections still held by sessions from earlier tests
+    checked_out = engine.pool.checkedout()
+    warm_pool()
+    assert engine.pool.checkedout() == checked_out
+    assert engine.pool.checkedin() >= 1
+
+
+def test_repeated_lazy_load_raises_when_guard_enabled():
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker, selectinload
+    from app.database import raise_on_repeated_lazy_loads
+    from app.models import Base, User
+
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    raise_on_repeated_lazy_loads(factory)
+
+    with factory() as db:
+        db.add_all([User(email="a@example.com", hashed_password="x"),
+                    User(email="b@example.com", hashed_password="x")])
+        db.commit()
+
+    with factory() as db:
+        users = db.query(User).options(selectinload(User.bookings)).all()
+        assert [u.bookings for u in users] == [[], []]
+
+    with factory() as db:
+        first, second = db.query(User).all()
+        first.bookings
+        with pytest.raises(RuntimeError, match="User.bookings"):
+            second.bookings
@@ -0,0 +1,26 @@
+from PIL import Image
+
+from app.images import transcode_to_webp, MAX_DIMENSION
+
+
+def test_transcode_to_webp_resizes_and_keeps_original(tmp_path):
+    original = tmp_path / "photo.png"
+    Image.new("RGB", (MAX_DIMENSION * 2, MAX_DIMENSION), "orange").save(original)
+
+    webp = transcode_to_webp(str(original))
+
+    assert webp == str(tmp_path / "photo.webp")
+    assert original.exists()
+    with Image.open(webp) as img:
+        assert img.format == "WEBP"
+        assert img.size == (MAX_DIMENSION, MAX_DIMENSION // 2)
+
+
+def test_transcode_to_webp_skips_gifs_and_bad_files(tmp_path):
+    gif = tmp_path / "anim.gif"
+    Image.new("P", (10, 10)).save(gif)
+    broken = tmp_path / "broken.jpg"
+    broken.write_bytes(b"not an image")
+
+    assert transcode_to_webp(str(gif)) is None
+    assert transcode_to_webp(str(broken)) is None
@@ -24,6 +24,7 @@ async def test_router_root():
 def test_app_has_middlewares():
     middleware_names = [middleware.cls.__name__ for middleware in app.user_middleware]
     assert "SessionMiddleware" in middleware_names
+    assert "DBSessionMiddleware" in middleware_names
     # assert "HTTPSRedirectMiddleware" not in middleware_names (uncomment if not using it)
 
 
@@ -0,0 +1,193 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base, User, Message, MessageStatus, Tour, Booking
+from app.crud.message import MessageCRUD
+from app.schemas.message import MessageCreate
+
+# Setup in-memory SQLite test DB
+engine = create_engine("sqlite:///:memory:")
+TestingSessionLocal = sessionmaker(bind=engine)
+
+@pytest.fixture(autouse=True)
+def create_tables():
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+@pytest.fixture
+def db():
+    db = TestingSessionLocal()
+    yield db
+    db.close()
+
+@pytest.fixture
+def users(db):
+    alice = User(email="alice@example.com", hashed_password="x", full_name="Alice")
+    bob = User(email="bob@example.com", hashed_password="x", full_name="Bob")
+    db.add_all([alice, bob])
+    db.commit()
+    return alice, bob
+
+
+def send(crud, sender, receiver, content="hi"):
+    return crud.create(sender.id, MessageCreate(receiver_id=receiver.id, content=content))
+
+
+def test_mark_conversation_as_read(db, users):
+    alice, bob = users
+    crud = MessageCRUD(db)
+    send(crud, bob, alice)
+    send(crud, bob, alice)
+    send(crud, alice, bob)
+
+    assert crud.mark_conversation_as_read(alice.id, bob.id) == 2
+    assert crud.get_unread_count(alice.id) == 0
+    assert crud.get_unread_count(bob.id) == 1
+
+
+def test_create_many_inserts_batch(db, users):
+    alice, bob = users
+    crud = MessageCRUD(db)
+    ids = crud.create_many(alice.id, [
+        MessageCreate(receiver_id=bob.id, content=f"msg {i}") for i in range(3)
+    ])
+
+    assert len(ids) == 3
+    assert [db.get(Message, i).content for i in ids] == ["msg 0", "msg 1", "msg 2"]
+    assert crud.get_unread_count(bob.id) == 3
+    assert crud.create_many(alice.id, []) == []
+
+
+def test_unread_counter_tracks_reads_and_deletes(db, users):
+    alice, bob = users
+    crud = MessageCRUD(db)
+    first = send(crud, bob, alice)
+    second = send(crud, bob, alice)
+    third = send(crud, bob, alice)
+    assert crud.get_unread_count(alice.id) == 3
+
+    crud.mark_as_read(first.id, alice.id)
+    crud.mark_as_read(first.id, alice.id)  # already read: no double decrement
+    assert crud.get_unread_count(alice.id) == 2
+
+    crud.delete_message(second.id, alice.id)
+    assert crud.get_unread_count(alice.id) == 1
+
+    crud.mark_conversation_as_read(alice.id, bob.id)
+    assert crud.get_unread_count(alice.id) == 0
+    assert db.get(Message, third.id).status == MessageStatus.READ
+
+
+def test_mark_as_read_only_for_receiver(db, users):
+    alice, bob = users
+    crud = MessageCRUD(db)
+    message = send(crud, bob, alice)
+
+    assert crud.mark_as_read(message.id, bob.id) is None
+    row = crud.mark_as_read(message.id, alice.id)
+    assert row.id == message.id
+    assert row.status == MessageStatus.READ
+    assert (row.sender_name, row.receiver_name) == ("Bob", "Alice")
+
+
+def test_delete_message_requires_participant(db, users):
+    alice, bob = users
+    carol = User(email="carol@example.com", hashed_password="x")
+    db.add(carol)
+    db.commit()
+    crud = MessageCRUD(db)
+    message = send(crud, alice, bob)
+
+    assert crud.delete_message(message.id, carol.id) is False
+    assert crud.delete_message(message.id, bob.id) is True
+    assert crud.get_message(message.id) is None
+
+
+def test_get_user_messages_returns_rows_with_names(db, users):
+    alice, bob = users
+    crud = MessageCRUD(db)
+    send(crud, alice, bob, "first")
+    send(crud, bob, alice, "second")
+
+    rows = crud.get_user_messages(alice.id)
+    assert {(r.content, r.sender_name, r.receiver_name) for r in rows} == {
+        ("first", "Alice", "Bob"),
+        ("second", "Bob", "Alice"),
+    }
+    assert len(crud.get_user_messages(alice.id, skip=1, limit=1)) == 1
+
+
+def test_get_conversation_returns_rows_with_names(db, users):
+    alice, bob = users
+    carol = User(email="carol@example.com", hashed_password="x")
+    db.add(carol)
+    db.commit()
+    crud = MessageCRUD(db)
+    send(crud, alice, bob, "first")
+    send(crud, bob, alice, "second")
+    send(crud, carol, alice, "elsewhere")
+
+    rows = crud.get_conversation(alice.id, bob.id)
+    assert [(r.content, r.sender_name, r.receiver_name) for r in rows] == [
+        ("first", "Alice", "Bob"),
+        ("second", "Bob", "Alice"),
+    ]
+
+
+def test_get_conversations_lists_each_peer_once(db, users):
+    alice, bob = users
+    carol = User(email="carol@example.com", hashed_password="x")
+    db.add(carol)
+    db.commit()
+    crud = MessageCRUD(db)
+    send(crud, alice, bob)
+    send(crud, bob, alice)
+    send(crud, carol, alice)
+
+    assert sorted(crud.get_conversations(alice.id)) == sorted([bob.id, carol.id])
+    assert crud.get_conversations(carol.id) == [alice.id]
+
+
+def test_get_inbox_returns_latest_message_per_peer(db, users):
+    alice, bob = users
+    carol = User(email="carol@example.com", hashed_password="x", full_name="")
+    db.add(carol)
+    db.commit()
+    crud = MessageCRUD(db)
+    send(crud, bob, alice, "first")
+    send(crud, alice, bob, "second")
+    send(crud, bob, alice, "latest from bob")
+    send(crud, carol, alice, "hello from carol")
+
+    inbox = {row.User.id: row for row in crud.get_inbox(alice.id)}
+
+    assert set(inbox) == {bob.id, carol.id}
+    assert inbox[bob.id].last_message == "latest from bob"
+    assert inbox[bob.id].unread_count == 2
+    assert inbox[carol.id].unread_count == 1
+    assert inbox[carol.id].booking_id is None
+
+
+def test_deleting_a_tour_releases_unread_booking_messages(db, users):
+    alice, bob = users
+    tour = Tour(
+        title="Gorillas", country="UG", included="a", not_included="b",
+        cancellation_policy="c", creator_id=bob.id,
+    )
+    db.add(tour)
+    db.flush()
+    booking = Booking(tour_id=tour.id, user_id=alice.id)
+    db.add(booking)
+    db.commit()
+    crud = MessageCRUD(db)
+    crud.create(alice.id, MessageCreate(receiver_id=bob.id, booking_id=booking.id, content="hi"))
+    send(crud, alice, bob)
+    assert crud.get_unread_count(bob.id) == 2
+
+    db.delete(tour)
+    db.commit()
+
+    assert db.query(Message).count() == 1
+    assert crud.get_unread_count(bob.id) == 1
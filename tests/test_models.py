@@ -3,7 +3,7 @@ from datetime import datetime
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
-from app.models import Base, User, Session, Tour, TourImage, Booking
+from app.models import Base, User, Session, Tour, TourImage, Booking, Review
 
 # Setup in-memory SQLite test DB
 engine = create_engine("sqlite:///:memory:")
@@ -45,3 +45,81 @@ def test_tour_image_model(db):
     db.add(image)
     db.flush()
     assert image.is_primary is False
+
+
+def test_session_id_is_native_uuid_on_postgres_only():
+    from sqlalchemy.dialects import postgresql, sqlite
+    id_type = Session.__table__.c.id.type
+    assert id_type.compile(dialect=postgresql.dialect()) == "UUID"
+    assert id_type.compile(dialect=sqlite.dialect()) == "VARCHAR(36)"
+
+
+def test_calculate_price_in_python_and_sql(db):
+    from sqlalchemy import func
+    tour = Tour(title="Safari", price=100.0, country="Kenya", included="-", not_included="-",
+                cancellation_policy="-")
+    db.add(tour)
+    db.flush()
+    db.add_all([
+        Booking(tour_id=tour.id, adults=2, kids=1, is_private=False),
+        Booking(tour_id=tour.id, adults=1, kids=0, is_private=True),
+    ])
+    db.flush()
+
+    assert tour.calculate_price(2, 1) == 300.0
+    assert tour.calculate_price(1, 0, True) == pytest.approx(135.0)
+    total = db.query(
+        func.sum(Tour.calculate_price(Booking.adults, Booking.kids, Booking.is_private))
+    ).join(Tour, Tour.id == Booking.tour_id).filter(Tour.id == tour.id).scalar()
+    assert total == pytest.approx(435.0)
+    db.rollback()
+
+
+def test_message_status_is_named_enum():
+    from sqlalchemy.dialects import postgresql
+    from app.models import Message
+    status = Message.__table__.c.status
+    assert status.nullable is False
+    assert status.type.compile(dialect=postgresql.dialect()) == "message_status"
+
+
+def test_primary_image_url_prefers_primary_image(db):
+    from sqlalchemy import select
+    from sqlalchemy.orm import undefer
+    tour = Tour(title="Gorillas", price=10.0, country="Uganda", included="-", not_included="-",
+                cancellation_policy="-")
+    db.add(tour)
+    db.flush()
+    db.add_all([
+        TourImage(tour_id=tour.id, image_url="/a.jpg"),
+        TourImage(tour_id=tour.id, image_url="/b.jpg", is_primary=True),
+    ])
+    db.flush()
+
+    loaded = db.scalars(
+        select(Tour).where(Tour.id == tour.id).options(undefer(Tour.primary_image_url))
+        .execution_options(populate_existing=True)
+    ).one()
+    assert loaded.primary_image_url == "/b.jpg"
+    db.rollback()
+
+
+def test_bookings_and_reviews_copy_tour_creator(db):
+    owner, buyer = User(email="owner@x.com"), User(email="buyer@x.com")
+    db.add_all([owner, buyer])
+    db.flush()
+    tour = Tour(title="Rafting", price=10.0, country="Uganda", included="-", not_included="-",
+                cancellation_policy="-", creator_id=owner.id)
+    db.add(tour)
+    db.flush()
+    booking = Booking(tour_id=tour.id, user_id=buyer.id, adults=1, kids=0)
+    review = Review(tour_id=tour.id, user_id=buyer.id, rating=5)
+    db.add_all([booking, review])
+    db.flush()
+    assert booking.creator_id == review.creator_id == owner.id
+
+    tour.creator_id = buyer.id
+    db.flush()
+    db.expire_all()
+    assert booking.creator_id == review.creator_id == buyer.id
+    db.rollback()
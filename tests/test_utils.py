@@ -59,4 +59,64 @@ def test_send_tour_notification(monkeypatch):
     assert sent['called'] is True
     assert sent['email'] == "user@example.com"
     assert "Nile Cruise" in sent['subject']
-    assert sent['html'] is True
\ No newline at end of file
+    assert sent['html'] is True
+
+@pytest.mark.asyncio
+async def test_is_image_upload_sniffs_magic_bytes():
+    import io
+    from fastapi import UploadFile
+    from starlette.datastructures import Headers
+
+    def upload(data, content_type):
+        return UploadFile(io.BytesIO(data), filename="x", headers=Headers({"content-type": content_type}))
+
+    png = upload(b"\x89PNG\r\n\x1a\n" + b"\0" * 32, "image/png")
+    assert await utils.is_image_upload(png)
+    assert await png.read() == b"\x89PNG\r\n\x1a\n" + b"\0" * 32  # rewound
+
+    assert await utils.is_image_upload(upload(b"RIFF\0\0\0\0WEBPVP8 ", "image/webp"))
+    assert not await utils.is_image_upload(upload(b"<?php echo 1; ?>", "image/jpeg"))
+    assert not await utils.is_image_upload(upload(b"\xff\xd8\xff\xe0", "image/svg+xml"))
+
+
+@pytest.mark.asyncio
+async def test_password_hashing_off_the_event_loop():
+    hashed = await utils.hash_password_async("securepassword")
+    assert hashed.startswith(f"$2b${utils.BCRYPT_ROUNDS}$")
+    assert await utils.verify_password_async("securepassword", hashed)
+    assert not await utils.verify_password_async("wrong", hashed)
+
+
+def test_date_filter_formats_dates_and_datetimes():
+    from datetime import date, datetime
+    from app.templating import format_date
+    assert format_date(datetime(2026, 3, 7, 14, 5)) == "2026-03-07"
+    assert format_date(date(2026, 3, 7), "%B %d, %Y") == "March 07, 2026"
+
+
+def test_get_current_user_resolves_session_once_per_request():
+    import uuid
+    from datetime import datetime, timedelta
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from starlette.requests import Request
+    from app.models import Base, User, Session
+
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    user = User(email="admin@example.com", is_admin=True)
+    db.add(user)
+    db.flush()
+    session_id = str(uuid.uuid4())
+    db.add(Session(id=session_id, user_id=user.id, expires_at=datetime.utcnow() + timedelta(minutes=5)))
+    db.commit()
+
+    def request(cookie):
+        return Request({"type": "http", "headers": [(b"cookie", f"auth_session_id={cookie}".encode())]})
+
+    req = request(session_id)
+    assert utils.get_current_user(req, db).id == user.id
+    db.close()  # a second lookup in the same request must not query again
+    assert utils.get_current_user(req, db) is req.state.current_user
+    assert utils.get_current_user(request(str(uuid.uuid4())), sessionmaker(bind=engine)()) is None